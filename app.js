@@ -1,5 +1,5 @@
 /*!
- * JFNB 공통 스크립트 v2 — 북마크 · 딥링크 · 하이라이트 · 복사 + 구글 로그인 동기화
+ * JFNB 공통 스크립트 v2 — 북마크 · 딥링크 · 하이라이트 · 복사 · 이전 보도 + 구글 로그인 동기화
  *
  * post_process.py가 아카이브 HTML head에 <script src="../app.js?v=N" defer>로 주입한다.
  * 카드 탐지는 빌드 타임에 끝나 있다 — 이 파일은 .jfnb-card 와 data-* 속성만 읽는다.
@@ -587,6 +587,19 @@
       dp.hidden = true;
       bar.appendChild(dp);
     }
+
+    // 🔗 이전 보도 — 관련 기사 표에 항목이 있는 카드에서만 드러난다 (revealRelated)
+    if (card.id) {
+      var rl = document.createElement('button');
+      rl.type = 'button';
+      rl.className = 'jfnb-btn jfnb-rl';
+      rl.setAttribute('aria-label', '이전 보도 보기');
+      rl.setAttribute('aria-expanded', 'false');
+      rl.title = '이전 보도';
+      rl.textContent = '🔗';
+      rl.hidden = true;
+      bar.appendChild(rl);
+    }
     return bar;
   }
 
@@ -691,6 +704,91 @@
     btn.classList.add('on');
   }
 
+  /* ══════════════ 이전 보도 (search/related/{파일}.json) ══════════════
+   * build_search_index.py가 기사마다 더 앞선 비슷한 기사를 골라 둔다.
+   * 📖와 같은 규칙 — 표에 항목이 없는 카드에는 버튼을 드러내지 않는다. */
+
+  var RELATED_CSS = [
+    '.jfnb-related{margin:14px 0 2px;padding:12px 16px;border-radius:12px;',
+    'background:rgba(255,255,255,.04);border:1px solid rgba(255,255,255,.1);font-size:.88rem}',
+    '.jfnb-related-h{margin:0 0 8px;font-size:.74rem;letter-spacing:.04em;color:#8fa6ff;font-weight:600}',
+    '.jfnb-related a{display:block;padding:5px 0;color:#c8cee2;text-decoration:none;line-height:1.5}',
+    '.jfnb-related a:hover{color:#fff}',
+    '.jfnb-related time{margin-right:8px;color:#7d849a;font-size:.8rem}'
+  ].join('');
+
+  var relatedMap = null;       // { items: {앵커: [refs 번호]}, refs: [[date, file, title, anchor]] }
+  var relatedTried = false;
+
+  function loadRelated() {
+    if (relatedTried) return Promise.resolve(relatedMap);
+    relatedTried = true;
+    // 관련 기사는 sync마다 다시 계산된다 — 캐시본을 쓰기 전에 서버에 확인한다 (바뀌지 않았으면 304)
+    return fetch('../search/related/' + encodeURIComponent(stem()) + '.json', { cache: 'no-cache' })
+      .then(function (r) { return r.ok ? r.json() : null; })
+      .then(function (j) {
+        relatedMap = (j && j.items) ? j : null;
+        return relatedMap;
+      })
+      .catch(function () { return null; });
+  }
+
+  function revealRelated() {
+    if (!relatedMap) return;
+    var btns = document.querySelectorAll('.jfnb-rl');
+    Array.prototype.forEach.call(btns, function (b) {
+      var card = b.closest('.jfnb-card');
+      if (card && relatedMap.items[card.id]) b.hidden = false;
+    });
+  }
+
+  function renderRelated(ids) {
+    var wrap = document.createElement('div');
+    wrap.className = 'jfnb-related';
+
+    var h = document.createElement('div');
+    h.className = 'jfnb-related-h';
+    h.textContent = '🔗 이전 보도';
+    wrap.appendChild(h);
+
+    ids.forEach(function (id) {
+      var ref = relatedMap.refs[id];
+      if (!ref) return;
+      var a = document.createElement('a');
+      a.href = encodeURIComponent(ref[1]) + '.html' + (ref[3] ? '#' + ref[3] : '');
+      var t = document.createElement('time');
+      t.textContent = ref[0] || '';
+      a.appendChild(t);
+      a.appendChild(document.createTextNode(ref[2] || ''));
+      wrap.appendChild(a);
+    });
+    return wrap;
+  }
+
+  function toggleRelated(card, btn) {
+    var open = card.querySelector(':scope > .jfnb-related');
+    if (open) {
+      open.remove();
+      btn.setAttribute('aria-expanded', 'false');
+      btn.classList.remove('on');
+      return;
+    }
+    var ids = relatedMap && relatedMap.items[card.id];
+    if (!ids) {
+      toast('이 기사는 이전 보도가 없습니다');
+      return;
+    }
+    if (!document.getElementById('jfnb-related-css')) {
+      var st = document.createElement('style');
+      st.id = 'jfnb-related-css';
+      st.textContent = RELATED_CSS;
+      document.head.appendChild(st);
+    }
+    card.appendChild(renderRelated(ids));
+    btn.setAttribute('aria-expanded', 'true');
+    btn.classList.add('on');
+  }
+
   function setBmState(btn, on) {
     btn.textContent = on ? '🔖' : '🏷️';
     btn.classList.toggle('on', on);
@@ -1090,6 +1188,11 @@
         return;
       }
 
+      if (btn.classList.contains('jfnb-rl')) {
+        toggleRelated(card, btn);
+        return;
+      }
+
       /* 보관 — 로그인 게이트 */
       if (!user) {
         var mark = null;
@@ -1129,6 +1232,8 @@
 
       // 상세 해설 — 파일이 있는 날짜에서만 📖가 드러난다
       loadDeep().then(revealDeep);
+      // 이전 보도 — 관련 기사 표에 있는 카드에서만 🔗가 드러난다
+      loadRelated().then(revealRelated);
     }
 
     /* 로그인 층 — 비로그인 사용자는 여기서 아무 요청도 하지 않는다 */
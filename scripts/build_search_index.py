@@ -2,6 +2,7 @@
 """
 Build search index from archive HTML files.
 Parses all HTML files in archive/ folder and creates search-index.json
+(--full-text: also full card text and deep/ summaries as varint postings)
 
 v4: Handles ALL HTML formats including:
 - Early briefings without <article> tags
@@ -12,155 +13,11 @@ v4: Handles ALL HTML formats including:
 import os
 import re
 import json
-from html.parser import HTMLParser
+import time
 from datetime import datetime
 
-
-class BriefingParser(HTMLParser):
-    """Parse briefing HTML to extract articles - handles all format versions."""
-    
-    def __init__(self):
-        super().__init__()
-        self.articles = []
-        self.current_section = ""
-        self.is_claudes_pick = False
-        
-        # Current article being built
-        self.pending_title = ""
-        self.pending_title_kr = ""
-        self.pending_summary = ""
-        
-        # Tag state
-        self.in_h2 = False
-        self.in_h3 = False
-        self.in_p = False
-        self.current_class = ""
-        self.current_text = ""
-        
-        # Track if we're inside an article tag
-        self.in_article_tag = False
-
-        # post_process.py가 구워둔 카드 앵커(id="art-N"). 순번을 추정하지 않는다.
-        self.current_anchor = None
-        
-    def _save_pending_article(self):
-        """Save the pending article if it has required fields."""
-        title = self.pending_title_kr or self.pending_title
-        summary = self.pending_summary
-        
-        if title and summary and len(summary) > 20:
-            self.articles.append({
-                'title': title.strip(),
-                'summary': summary.strip()[:300],
-                'section': self.current_section,
-                'is_pick': self.is_claudes_pick,
-                'anchor': self.current_anchor
-            })
-        
-        # Reset pending
-        self.pending_title = ""
-        self.pending_title_kr = ""
-        self.pending_summary = ""
-        
-    def handle_starttag(self, tag, attrs):
-        attrs_dict = dict(attrs)
-        self.current_class = attrs_dict.get('class', '')
-
-        # 카드 경계는 태그 이름이 아니라 정규화된 id로 잡는다.
-        # 주간·초기판은 <article>이 아니라 <div>를 쓰므로 이쪽이 모든 세대에 통한다.
-        el_id = attrs_dict.get('id', '')
-        if el_id.startswith('art-'):
-            self._save_pending_article()
-            self.current_anchor = el_id
-
-        if tag == 'article':
-            self.in_article_tag = True
-            # Save any pending article before starting new one
-            self._save_pending_article()
-            
-        if tag == 'h2':
-            self.in_h2 = True
-            self.current_text = ""
-            
-        if tag == 'h3':
-            # New h3 means new article - save previous if exists
-            if self.pending_title and not self.in_article_tag:
-                self._save_pending_article()
-            self.in_h3 = True
-            self.current_text = ""
-            
-        if tag == 'p':
-            self.in_p = True
-            self.current_text = ""
-                
-    def handle_endtag(self, tag):
-        if tag == 'article':
-            self.in_article_tag = False
-            self._save_pending_article()
-            
-        if tag == 'h2' and self.in_h2:
-            self.in_h2 = False
-            section = self.current_text.strip()
-            self.current_section = section
-            
-            # Detect Claude's Pick section
-            pick_keywords = ["Claude's Pick", "클로드", "💎", "Pick", "PICK"]
-            section_keywords = ["TOP", "🔥", "AI", "🤖", "경제", "💰", "반도체", "💾", "글로벌", "🌏", "🌐", "Headlines", "기술"]
-            
-            if any(x in section for x in pick_keywords):
-                self.is_claudes_pick = True
-            elif any(x in section for x in section_keywords):
-                self.is_claudes_pick = False
-                
-            self.current_text = ""
-            
-        if tag == 'h3' and self.in_h3:
-            self.in_h3 = False
-            title = self.current_text.strip()
-            # Remove badges
-            title = re.sub(r'\s*(HOT|NEW|PICK)\s*$', '', title).strip()
-            
-            if title:
-                # Check if this is Korean title based on class or content
-                if 'kr' in self.current_class.lower():
-                    self.pending_title_kr = title
-                elif re.search(r'[가-힣]', title):
-                    # Contains Korean characters
-                    self.pending_title_kr = title
-                else:
-                    self.pending_title = title
-                    
-            self.current_class = ""
-            self.current_text = ""
-            
-        if tag == 'p' and self.in_p:
-            self.in_p = False
-            text = self.current_text.strip()
-            text = re.sub(r'\s+', ' ', text)
-            
-            if text and len(text) > 15:
-                # Determine what this paragraph is
-                if 'title-kr' in self.current_class or 'article-title-kr' in self.current_class:
-                    self.pending_title_kr = text
-                elif 'summary' in self.current_class:
-                    self.pending_summary = text
-                elif not self.pending_summary and (self.pending_title or self.pending_title_kr):
-                    # First substantial paragraph after title is summary
-                    # Skip if it looks like metadata (sources, dates)
-                    if not re.match(r'^(TechCrunch|Bloomberg|CNBC|BBC|Wired|Reuters|📅|Score:)', text):
-                        self.pending_summary = text
-                        
-            self.current_class = ""
-            self.current_text = ""
-            
-    def handle_data(self, data):
-        if self.in_h2 or self.in_h3 or self.in_p:
-            self.current_text += data
-            
-    def get_articles(self):
-        # Save any remaining pending article
-        self._save_pending_article()
-        return self.articles
+import card_manifest
+from pattern_scan import LiteralScanner
 
 
 def extract_date_from_filename(filename):
@@ -177,44 +34,51 @@ def extract_date_from_filename(filename):
     return None
 
 
+# 키워드 사전 — 패턴 하나가 키워드 하나. 대안은 리터럴만 ("|"로 구분, 정규식 문법 없음).
+# 패턴마다 텍스트에서 가장 먼저 걸린 대안이 (소문자로) 키워드가 된다. 새 회사는 줄을 추가하면 된다.
+KEYWORD_PATTERNS = [
+    r'삼성|Samsung', r'SK하이닉스|SK Hynix|하이닉스',
+    r'네이버|Naver', r'카카오|Kakao',
+    r'엔비디아|Nvidia|NVIDIA', r'인텔|Intel',
+    r'AMD|에이엠디', r'TSMC', r'마이크론|Micron',
+    r'애플|Apple', r'구글|Google', r'마이크로소프트|Microsoft',
+    r'아마존|Amazon', r'메타|Meta|Facebook',
+    r'테슬라|Tesla', r'OpenAI|오픈AI|GPT',
+    r'Anthropic|앤트로픽|클로드|Claude',
+    r'반도체', r'HBM', r'AI|인공지능',
+    r'로봇', r'자율주행', r'전기차|EV',
+    r'트럼프|Trump', r'중국|China',
+    r'BYD|비야디', r'Grok', r'xAI',
+    r'Netflix|넷플릭스', r'DOGE', r'TikTok|틱톡',
+    r'CES|다보스', r'IPO', r'투자|펀딩',
+    r'Groq', r'금|Gold', r'은|Silver',
+]
+KEYWORD_SCANNER = LiteralScanner(KEYWORD_PATTERNS)
+PROPER_NOUN_RE = re.compile(r'\b[A-Z][a-zA-Z]+\b')
+
+
 def extract_keywords(title, summary):
     """Extract searchable keywords."""
-    text = f"{title} {summary}".lower()
-    keywords = set()
+    text = f"{title} {summary}"
+    keywords = {}
     
     # Proper nouns
-    proper_nouns = re.findall(r'\b[A-Z][a-zA-Z]+\b', f"{title} {summary}")
-    keywords.update(word.lower() for word in proper_nouns if len(word) > 2)
+    keywords.update((word.lower(), None) for word in PROPER_NOUN_RE.findall(text) if len(word) > 2)
     
-    # Known patterns
-    patterns = [
-        r'삼성|Samsung', r'SK하이닉스|SK Hynix|하이닉스',
-        r'네이버|Naver', r'카카오|Kakao',
-        r'엔비디아|Nvidia|NVIDIA', r'인텔|Intel',
-        r'AMD|에이엠디', r'TSMC', r'마이크론|Micron',
-        r'애플|Apple', r'구글|Google', r'마이크로소프트|Microsoft',
-        r'아마존|Amazon', r'메타|Meta|Facebook',
-        r'테슬라|Tesla', r'OpenAI|오픈AI|GPT',
-        r'Anthropic|앤트로픽|클로드|Claude',
-        r'반도체', r'HBM', r'AI|인공지능',
-        r'로봇', r'자율주행', r'전기차|EV',
-        r'트럼프|Trump', r'중국|China',
-        r'BYD|비야디', r'Grok', r'xAI',
-        r'Netflix|넷플릭스', r'DOGE', r'TikTok|틱톡',
-        r'CES|다보스', r'IPO', r'투자|펀딩',
-        r'Groq', r'금|Gold', r'은|Silver',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            keywords.add(match.group().lower())
+    # Known patterns — 사전 전체를 한 번 훑는다 (패턴별 re.search와 같은 결과)
+    found = KEYWORD_SCANNER.first_matches(text.lower())
+    keywords.update((found[k][0].lower(), None) for k in sorted(found))
     
+    # 발견 순서 유지 (dict). set이면 15개 상한에서 남는 키워드가 PYTHONHASHSEED에 따라 바뀌었다
     return list(keywords)[:15]
 
 
-def parse_briefing_file(filepath):
-    """Parse a single briefing HTML file."""
+def parse_briefing_file(filepath, use_manifest=False):
+    """
+    Parse a single briefing HTML file.
+    use_manifest면 post_process가 카드 매니페스트(data/cards.json)에 구워 둔 기사 목록을 쓴다
+    (파일 내용이 구울 때 그대로일 때만). 키워드·중복 제거는 어느 쪽이든 여기서 새로 한다.
+    """
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -225,14 +89,15 @@ def parse_briefing_file(filepath):
     filename = os.path.basename(filepath)
     date = extract_date_from_filename(filename)
     
-    parser = BriefingParser()
-    try:
-        parser.feed(content)
-    except Exception as e:
-        print(f"Error parsing {filepath}: {e}")
-        return []
-    
-    articles = parser.get_articles()
+    entry = card_manifest.fresh_entry(filepath, content) if use_manifest else None
+    if entry is not None:
+        articles = entry['search']
+    else:
+        try:
+            articles = card_manifest.parse_search(content)
+        except Exception as e:
+            print(f"Error parsing {filepath}: {e}")
+            return []
     
     # Deduplicate and format
     result = []
@@ -265,26 +130,65 @@ def parse_briefing_file(filepath):
     return result
 
 
-def build_search_index(archive_dir='archive'):
-    """Build search index from all archive files."""
+def _parse_job(filepath):
+    """작업 프로세스 진입점. 반환: (기사 목록, 파싱 소요 초)."""
+    start = time.perf_counter()
+    articles = parse_briefing_file(filepath)
+    return articles, time.perf_counter() - start
+
+
+def build_search_index(archive_dir='archive', incremental=False, workers=1):
+    """
+    Build search index from all archive files.
+    incremental이면 카드 매니페스트에 지금 내용 그대로 구워진 파일은 파싱하지 않고 그 기사 목록을 쓴다.
+    파싱 결과의 출처는 매니페스트 하나뿐이다 — 무효화도 매니페스트 규칙(파일 해시 + card_manifest.code_version)을 따르고,
+    키워드 추출(extract_keywords)은 캐시하지 않으므로 키워드 코드가 바뀌어도 낡은 결과가 남지 않는다.
+    workers > 1이면 파싱을 프로세스 풀에 나눠 돌린다. 결과는 파일명 역순으로 합치므로
+    기사 순서·출력은 직렬 빌드와 같다.
+    """
     if not os.path.exists(archive_dir):
         print(f"Archive directory '{archive_dir}' not found")
         return {'articles': [], 'total': 0, 'picks': 0, 'updated': datetime.now().isoformat()}
     
+    wall = time.perf_counter()
+    filenames = [f for f in sorted(os.listdir(archive_dir), reverse=True) if f.endswith('.html')]
+    results, jobs = {}, []
+    for filename in filenames:
+        filepath = os.path.join(archive_dir, filename)
+        if incremental and card_manifest.fresh_entry(filepath) is not None:
+            results[filename] = (parse_briefing_file(filepath, use_manifest=True), None)
+            continue
+        jobs.append(filename)
+
+    paths = [os.path.join(archive_dir, f) for f in jobs]
+    if workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as ex:
+            parsed = list(ex.map(_parse_job, paths, chunksize=8))
+    else:
+        parsed = [_parse_job(path) for path in paths]
+    results.update(zip(jobs, parsed))
+
     all_articles = []
     pick_count = 0
-    
-    for filename in sorted(os.listdir(archive_dir), reverse=True):
-        if filename.endswith('.html'):
-            filepath = os.path.join(archive_dir, filename)
-            articles = parse_briefing_file(filepath)
-            
-            picks = sum(1 for a in articles if a.get('is_pick'))
-            pick_count += picks
-            
-            all_articles.extend(articles)
-            print(f"Parsed {filename}: {len(articles)} articles ({picks} picks)")
-    
+    for filename in filenames:
+        articles, elapsed = results[filename]
+        picks = sum(1 for a in articles if a.get('is_pick'))
+        pick_count += picks
+        all_articles.extend(articles)
+        took = '[매니페스트]' if elapsed is None else f"{elapsed * 1000:.1f}ms"
+        print(f"Parsed {filename}: {len(articles)} articles ({picks} picks) {took}")
+
+    if incremental:
+        print(f"[INCR] 파싱 {len(jobs)}개 / 매니페스트 {len(filenames) - len(jobs)}개")
+
+    timed = [(results[f][1], f) for f in jobs]
+    if timed:
+        slowest = sorted(timed, reverse=True)[:3]
+        print(f"[TIME] 파싱 {len(timed)}개 합계 {sum(t for t, _ in timed):.2f}s / "
+              f"벽시계 {time.perf_counter() - wall:.2f}s (workers {workers}) · 최장 "
+              + ', '.join(f"{f} {t * 1000:.0f}ms" for t, f in slowest))
+
     with_anchor = sum(1 for a in all_articles if a.get('anchor'))
     rate = (with_anchor * 100 // len(all_articles)) if all_articles else 0
     print(f"[ANCHOR] {with_anchor}/{len(all_articles)} ({rate}%) 항목에 앵커 부여")
@@ -301,16 +205,835 @@ def build_search_index(archive_dir='archive'):
     return index
 
 
-def main():
+# ── 역색인 (search/) ──────────────────────────────────────────────
+# search.html이 검색어의 샤드만 받아 매칭 포스팅만 더하도록 쪼갠 출력. 달 단위로 나눈다.
+#   search/index.json               : 매니페스트 (BM25 통계, 파티션 목록 — 최신 달 먼저, 기사 수, term 수,
+#                                     tf 코드 진법, 해시)
+#   search/<YYYY-MM>/articles.json  : 그 달 기사 메타 표 (파티션 안 순번 순)
+#   search/<YYYY-MM>/lens.json      : 기사별 필드 길이 [title, summary, keywords(, text)]
+#   search/<YYYY-MM>/bloom.json     : 그 달 term(과 모든 접두)의 블룸 필터
+#   search/<YYYY-MM>/terms/XX.json  : term → [순번 차이 ..., tf 코드 ...] (pack_fields — 평평한 수 배열)
+#   search/df/XX.json               : {"terms": {term: df}, "text": {term: df}} — 전체 기사 기준
+#   search/dups.json                : 같은 기사 묶음 — {파티션: {순번: [대표 파티션, 대표 순번]}}
+# 날짜가 없는 항목(스페셜)은 'special' 파티션. 페이지는 최신 달부터 검색해 결과를 바로 보이고,
+# 블룸 필터가 "없다"고 하는 달은 받지 않는다.
+# term은 한글이면 음절 바이그램, 그 밖(라틴·숫자)은 단어. 조사가 붙은 어절("엔비디아의")도
+# 바이그램 대부분이 겹치므로 잡힌다. 샤드는 term 첫 글자로 정한다 — 라틴 단어의 접두 검색
+# ("nvid" → "nvidia")이 샤드 하나로 끝난다.
+# 점수는 필드별 BM25에 필드 가중치(기존 10/5/3을 1/0.5/0.3으로)를 곱해 더한 값(BM25F 근사).
+# 파티션 파일에는 원시 tf와 길이만 두고, idf(df/)·평균 길이(매니페스트)로 페이지가 점수를 낸다.
+# idf를 구워 두면 기사 하나가 빠져도 모든 달의 샤드가 바뀌어 매 sync가 search/ 대부분을 다시
+# 커밋했다. 지금은 지난 달 파일이 그 달 기사가 바뀔 때만 바뀐다 — 달을 넘는 정보(df, 같은 기사
+# 묶음)는 달 파일 밖에 둔다. 기사는 파티션 안 순번으로 가리켜 앞 달 기사 수가 바뀌어도 그대로다.
+SEARCH_DIR = 'search'
+TERM_SHARDS = 64                # 파티션당
+BLOOM_BITS_PER_KEY = 10         # k=7과 함께 오탐 약 1%
+BLOOM_HASHES = 7
+ARTICLE_FIELDS = ['date', 'file', 'title', 'summary', 'anchor', 'is_pick']
+FIELD_WEIGHTS = [('title', 10), ('summary', 5), ('keywords', 3)]   # search.html 기존 가중치
+BM25_K1 = 1.2
+BM25_B = 0.75
+DF_DIR = 'df'
+DUPS_FILE = 'dups.json'
+TOKEN_RE = re.compile(r'[가-힣]+|[^\W가-힣]+')
+DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}$')
+
+
+def tokenize(text):
+    """소문자 단어 토큰. 한글과 그 밖의 글자가 맞붙은 곳에서도 끊는다 ("sk하이닉스" → sk, 하이닉스)."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def index_terms(text):
+    """색인 term 목록 (중복 포함 — tf용). 한글 토큰은 음절 바이그램, 한 글자면 그대로."""
+    terms = []
+    for token in tokenize(text):
+        if '가' <= token[0] <= '힣' and len(token) > 1:
+            terms.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            terms.append(token)
+    return terms
+
+
+def term_shard(term):
+    return ord(term[0]) % TERM_SHARDS
+
+
+def partition_key(date):
+    """기사 date → 파티션 이름. 날짜 형식이 아니면 'special'."""
+    return date[:7] if date and DATE_RE.match(date) else 'special'
+
+
+def stable_order(articles):
+    """
+    기사 id 순서. 날짜(없으면 맨 앞) → 파일 → 파일 내 순서.
+    새 브리핑은 뒤에 붙으므로 기존 기사의 id와 샤드 내용이 매일 흔들리지 않는다.
+    같은 달의 기사는 id가 연속이다 — 파티션은 id 구간 하나다.
+    """
+    def key(item):
+        pos, a = item
+        date = a.get('date') or ''
+        return (date if DATE_RE.match(date) else '', a.get('file', ''), pos)
+    return [a for _, a in sorted(enumerate(articles), key=key)]
+
+
+def _field_text(article, name):
+    value = article.get(name) or ''
+    return ' '.join(value) if isinstance(value, list) else value
+
+
+def field_postings(ordered):
+    """
+    stable_order 순 기사 → (기사별 필드 길이 [[title, summary, keywords], ...],
+                            {term: [[기사 id, tf_title, tf_summary, tf_keywords], ...]}).
+    """
+    from collections import Counter
+
+    tfs = [[Counter(index_terms(_field_text(a, name))) for name, _ in FIELD_WEIGHTS] for a in ordered]
+    raw = {}
+    for aid, doc in enumerate(tfs):
+        for term in dict.fromkeys(t for c in doc for t in c):
+            raw.setdefault(term, []).append([aid, *(c.get(term, 0) for c in doc)])
+    return [[sum(c.values()) for c in doc] for doc in tfs], raw
+
+
+def bm25_stats(lens):
+    """기사별 필드 길이 → (기사 수, 필드별 평균 길이). search.html이 매니페스트에서 받는 값이다."""
+    n_docs = max(len(lens), 1)
+    n_fields = len(lens[0]) if lens else 0
+    return n_docs, [max(sum(l[f] for l in lens) / n_docs, 1.0) for f in range(n_fields)]
+
+
+def bm25_score(tfs, lengths, idf, avg_len, weights):
+    """필드별 tf·길이 → Σ 가중치/10 × idf × BM25 tf 항. search.html bm25Score와 같은 계산이다."""
+    score = 0.0
+    for tf, length, avg, weight in zip(tfs, lengths, avg_len, weights):
+        if tf:
+            norm = 1 - BM25_B + BM25_B * length / avg
+            score += weight / 10 * idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+    return score
+
+
+def bm25_idf(df, n_docs):
+    from math import log
+    return log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+
+def score_postings(lens, raw, weights=None):
+    """field_postings 결과 → {term: [[기사 id, 점수×100], ...]}. 관련 기사·같은 기사 묶음이 쓴다."""
+    weights = weights or [w for _, w in FIELD_WEIGHTS]
+    n_docs, avg_len = bm25_stats(lens)
+    postings = {}
+    for term, plist in raw.items():
+        idf = bm25_idf(len(plist), n_docs)
+        postings[term] = [[p[0], max(1, round(bm25_score(p[1:], lens[p[0]], idf, avg_len, weights) * 100))]
+                          for p in plist]
+    return postings
+
+
+def build_inverted_index(articles):
+    """반환: (기사 메타 행 목록, {term: [[기사 id, 점수×100], ...]}). 기사 id는 행 번호."""
+    ordered = stable_order(articles)
+    rows = [[a.get(f) for f in ARTICLE_FIELDS] for a in ordered]
+    return rows, score_postings(*field_postings(ordered))
+
+
+def _fnv1a(data, h):
+    for byte in data:
+        h = ((h ^ byte) * 16777619) & 0xffffffff
+    return h
+
+
+def bloom_positions(key, m):
+    """
+    블룸 비트 위치 (이중 해싱, 32비트 FNV-1a 두 개). search.html bloomHas와 같은 계산이다 —
+    한쪽을 바꾸면 다른 쪽도 바꿀 것.
+    """
+    data = key.encode('utf-8')
+    h1 = _fnv1a(data, 0x811c9dc5)
+    h2 = _fnv1a(data, 0x01000193) | 1
+    return [((h1 + i * h2) & 0xffffffff) % m for i in range(BLOOM_HASHES)]
+
+
+def bloom_filter(terms):
+    """
+    term과 그 모든 접두를 넣은 블룸 필터 → {"m": 비트 수, "bits": base64}.
+    접두까지 넣는 것은 접두 검색("nvid", 한 글자 "금") 때문이다.
+    """
+    import base64
+
+    keys = {t[:i] for t in terms for i in range(1, len(t) + 1)}
+    m = max(64, -(-len(keys) * BLOOM_BITS_PER_KEY // 8) * 8)
+    bits = bytearray(m // 8)
+    for key in keys:
+        for pos in bloom_positions(key, m):
+            bits[pos >> 3] |= 1 << (pos & 7)
+    return {'m': m, 'bits': base64.b64encode(bytes(bits)).decode('ascii')}
+
+
+def partition_bounds(rows):
+    """반환: [[파티션 이름, 첫 기사 id, 기사 수], ...] — 기사 id 순. 파티션은 id 구간 하나다."""
+    date_col = ARTICLE_FIELDS.index('date')
+    bounds = []
+    for aid, row in enumerate(rows):
+        key = partition_key(row[date_col])
+        if bounds and bounds[-1][0] == key:
+            bounds[-1][2] += 1
+        else:
+            if any(b[0] == key for b in bounds):
+                raise RuntimeError(f"파티션 {key}의 기사 id가 연속이 아니다 — stable_order 확인")
+            bounds.append([key, aid, 1])
+    return bounds
+
+
+def partition_index(bounds, postings):
+    """
+    반환: [(파티션 이름, 첫 기사 id, 기사 수, {샤드 번호: {term: 포스팅}}), ...] — 기사 id 순.
+    포스팅은 기사 id 오름차순이라 파티션별로 자르면 된다.
+    """
+    owner = [None] * sum(count for _, _, count in bounds)
+    parts = []
+    for key, first, count in bounds:
+        part = (key, first, count, {})
+        parts.append(part)
+        owner[first:first + count] = [part] * count
+    for term, plist in postings.items():
+        for posting in plist:
+            owner[posting[0]][3].setdefault(term_shard(term), {}).setdefault(term, []).append(posting)
+    return parts
+
+
+def pack_fields(plist, first, base):
+    """
+    [[기사 id, tf_title, tf_summary, tf_keywords], ...] (id 오름차순) → [id 차이 ..., tf 코드 ...].
+    id는 first부터의 차이, tf 코드는 필드별 tf를 base진법 한 수로 (title이 가장 낮은 자리).
+    중첩 배열 대신 평평한 수 배열이라 terms/ 파일이 절반 크기이고 페이지의 JSON 파싱도 가볍다.
+    """
+    deltas, codes, prev = [], [], first
+    for aid, *tfs in plist:
+        deltas.append(aid - prev)
+        codes.append(sum(tf * base ** f for f, tf in enumerate(tfs)))
+        prev = aid
+    return deltas + codes
+
+
+def unpack_fields(values, first, base, n_fields=len(FIELD_WEIGHTS)):
+    """pack_fields의 역. search.html termPostings와 같은 계산이다."""
+    n = len(values) // 2
+    plist, aid = [], first
+    for delta, code in zip(values[:n], values[n:]):
+        aid += delta
+        plist.append([aid, *(code // base ** f % base for f in range(n_fields))])
+    return plist
+
+
+def _dump(path, obj, written=None):
+    """
+    압축 JSON을 쓰고 그 문자열을 돌려준다. json.dump(스트리밍)는 C 인코더를 못 써 몇 배 느리다.
+    디스크의 파일이 이미 같은 내용이면 쓰지 않는다. written(dict)에는 {경로: 새로 썼는지}를 남긴다 — _prune용.
+    """
+    text = json.dumps(obj, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    try:
+        with open(path, encoding='utf-8') as f:
+            same = f.read() == text
+    except OSError:
+        same = False
+    if not same:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    if written is not None:
+        written[os.path.normpath(path)] = not same
+    return text
+
+
+def _prune(root, written, skip=()):
+    """
+    root 아래에서 이번 빌드가 쓰지 않은 *.json을 지운다 (샤드 수·파티션·전문 색인 여부가 바뀐 뒤의 찌꺼기).
+    skip은 root 바로 아래의 하위 디렉터리 중 다른 단계가 관리하는 것. 반환: 지운 파일 수.
+    """
+    removed = 0
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        if os.path.relpath(dirpath, root).split(os.sep)[0] in skip:
+            continue
+        for name in filenames:
+            path = os.path.normpath(os.path.join(dirpath, name))
+            if name.endswith('.json') and path not in written:
+                os.remove(path)
+                removed += 1
+        if dirpath != root and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed
+
+
+def _report_writes(label, root, written, removed):
+    changed = sum(written.values())
+    print(f"[{label}] {root}/ 파일 {len(written)}개 중 바뀐 것 {changed}개만 기록 · 지운 파일 {removed}개")
+
+
+def duplicate_heads(rows, postings, bounds):
+    """
+    같은 기사 묶음 → {파티션: {순번: [대표 파티션, 대표 순번]}} (대표 자신 포함, 혼자인 기사는 없다)와
+    {기사 id: 대표 기사 id}. numpy가 없으면 둘 다 빈 표.
+    """
+    try:
+        canon = near_duplicate_groups(rows, postings)
+    except ImportError:
+        print("[DUP] numpy 없음 — 같은 기사 묶음 생략")
+        return {}, {}
+    ref = [(key, aid - first) for key, first, count in bounds for aid in range(first, first + count)]
+    heads, table = {}, {}
+    for aid, head in enumerate(canon):
+        if head is not None:
+            heads[aid] = head
+            key, lid = ref[aid]
+            table.setdefault(key, {})[str(lid)] = list(ref[head])
+    return table, heads
+
+
+def write_inverted_index(index, out_dir=SEARCH_DIR, drop_dup_summaries=False, full_text=False,
+                         archive_dir='archive'):
+    """
+    search/ 아래에 달별 역색인을 쓴다. 내용이 그대로인 파일은 다시 쓰지 않고, 이번 빌드에 없는
+    이전 파일은 지운다 (샤드 수가 바뀌어도 찌꺼기 없음). related/는 write_related가 관리한다.
+    full_text면 전문 색인(text/)도 쓰고, 블룸 필터에 전문 term을 더한다.
+    drop_dup_summaries면 같은 기사 묶음의 대표가 아닌 기사 요약을 비운다 — 검색은 역색인이 하므로
+    결과는 같고, 페이지는 묶음의 다른 기사 요약이나 대표 기사 요약(dups.json)을 보여 준다.
+    반환: (기사 메타 행, 필드 길이, 원시 tf 포스팅) — 관련 기사 계산용.
+    """
+    import hashlib
+
+    ordered = stable_order(index['articles'])
+    rows = [[a.get(f) for f in ARTICLE_FIELDS] for a in ordered]
+    lens, raw = field_postings(ordered)
+    postings = score_postings(lens, raw)
+    n_docs, avg_len = bm25_stats(lens)
+    bounds = partition_bounds(rows)
+    dups, heads = duplicate_heads(rows, postings, bounds)
+    if drop_dup_summaries:
+        summary_col = ARTICLE_FIELDS.index('summary')
+        for aid, head in heads.items():
+            if head != aid:
+                rows[aid][summary_col] = ''
+
+    text_raw, text_parts, part_lens = {}, {}, lens
+    bm25 = {'k1': BM25_K1, 'b': BM25_B, 'n': n_docs, 'avg_len': avg_len,
+            'weights': [w for _, w in FIELD_WEIGHTS]}
+    if full_text:
+        text_lens, text_raw = build_text_postings(article_texts(ordered, archive_dir))
+        text_parts = {key: shards for key, _, _, shards in partition_index(bounds, text_raw)}
+        part_lens = [l + [t] for l, t in zip(lens, text_lens)]
+        bm25.update(text_weight=TEXT_WEIGHT, text_avg_len=bm25_stats([[t] for t in text_lens])[1][0])
+    written = {}
+    manifest = []
+    text_bytes = 0
+    for key, first, count, shards in partition_index(bounds, raw):
+        part_dir = os.path.join(out_dir, key)
+        text_shards = text_parts.get(key, {})
+        terms = [t for group in (shards, text_shards) for ts in group.values() for t in ts]
+        # tf 코드의 진법 — 그 달 최대 tf + 1 (다른 달 파일에 영향이 없다)
+        base = 1 + max((tf for ts in shards.values() for plist in ts.values() for p in plist for tf in p[1:]),
+                       default=1)
+        # 파티션 파일은 전부 그 달 기사만으로 정해진다 — 파티션 해시 하나로 캐시한다.
+        files = [('articles', rows[first:first + count]), ('lens', part_lens[first:first + count]),
+                 ('bloom', bloom_filter(terms))]
+        for shard in range(TERM_SHARDS):
+            packed = {t: pack_fields(plist, first, base) for t, plist in shards.get(shard, {}).items()}
+            if any(unpack_fields(v, first, base) != shards[shard][t] for t, v in packed.items()):
+                raise RuntimeError(f"{key} terms/{shard:02x} 왕복 복원 불일치 — search/를 쓰지 않는다")
+            files.append((f'terms/{shard:02x}', packed))
+        if full_text:
+            files += [(f'{TEXT_DIR}/{shard:02x}', {t: pack_postings(p, first)
+                                                  for t, p in text_shards.get(shard, {}).items()})
+                      for shard in range(TERM_SHARDS)]
+        h = hashlib.sha256()
+        for name, obj in files:
+            text = _dump(os.path.join(part_dir, f'{name}.json'), obj, written).encode('utf-8')
+            h.update(text)
+            if name.startswith(TEXT_DIR + '/'):
+                text_bytes += len(text)
+        manifest.append({'key': key, 'first': first, 'count': count, 'tf_base': base,
+                         'terms': sum(map(len, shards.values())), 'h': h.hexdigest()[:16]})
+
+    # 문서 빈도 — term 샤드와 같은 번호로 나눠 검색어 샤드만 받게 한다
+    df = {}
+    for kind, src in (('terms', raw), ('text', text_raw)):
+        for term, plist in src.items():
+            df.setdefault(term_shard(term), {'terms': {}, 'text': {}})[kind][term] = len(plist)
+    df_hash = hashlib.sha256()
+    for shard in range(TERM_SHARDS):
+        text = _dump(os.path.join(out_dir, DF_DIR, f'{shard:02x}.json'), df.get(shard, {'terms': {}, 'text': {}}),
+                     written)
+        df_hash.update(text.encode('utf-8'))
+    dups_hash = hashlib.sha256(_dump(os.path.join(out_dir, DUPS_FILE), dups, written).encode('utf-8'))
+
+    # 최신 달 먼저 — 페이지가 이 순서대로 검색한다 ('special'은 맨 뒤)
+    manifest.sort(key=lambda p: (p['key'] != 'special', p['key']), reverse=True)
+    _dump(os.path.join(out_dir, 'index.json'), {
+        'v': 5,
+        'total': len(rows),
+        'fields': ARTICLE_FIELDS,
+        'scoring': 'bm25',
+        'bm25': bm25,
+        'df': df_hash.hexdigest()[:16],            # df/ 캐시 무효화용 (내용이 같으면 그대로)
+        'dups': dups_hash.hexdigest()[:16],
+        'term_shards': TERM_SHARDS,
+        'bloom_hashes': BLOOM_HASHES,
+        'full_text': full_text,
+        'partitions': manifest,
+    }, written)
+    removed = _prune(out_dir, written, skip=(RELATED_DIR,))
+    print(f"[INDEX] 역색인: 기사 {len(rows)}건 / term {len(raw)}개 / "
+          f"포스팅 {sum(map(len, raw.values()))}건 / 파티션 {len(manifest)}개 → {out_dir}/")
+    if full_text:
+        print(f"[INDEX] 전문 색인: term {len(text_raw)}개 / 포스팅 {sum(map(len, text_raw.values()))}건 / "
+              f"text/ {text_bytes / 1024:,.0f}KB")
+    _report_writes('INDEX', out_dir, written, removed)
+    return rows, lens, raw
+
+
+# ── 관련 기사 (search/related/) ──────────────────────────────────
+# 기사마다 "이전 보도" — 더 앞선 기사 중 비슷한 것 상위 RELATED_K개를 빌드 때 계산해 둔다.
+#   search/related/<파일>.json : {"items": {앵커: [refs 번호, ...]}, "refs": [[date, file, title, anchor], ...]}
+# 아카이브 페이지(app.js)는 자기 파일 하나만 받는다 — refs에 링크에 필요한 것이 다 있다.
+# refs 번호는 파일 안에서만 쓰는 번호다. 전체 기사 id를 적으면 앞선 기사가 하나 빠질 때마다
+# 모든 파일이 바뀐다.
+# 벡터는 역색인의 BM25 점수(제목·요약·키워드 필드 가중, idf 포함) 그대로 — tf-idf 가중의 한 형태다.
+# idf·평균 길이는 그 달 말까지의 기사로 잡는다. 가리키는 기사가 전부 더 앞선 것이라 지난 달 파일은
+# 새 기사가 들어오거나 나중 기사가 빠져도 그대로다 — 전체 기준이면 문턱 근처 쌍이 매일 뒤집혔다.
+# 코사인 유사도 X·Xᵀ를 행 블록 단위 희소 곱(포스팅 펼치기 + bincount)으로 구한다. 쌍 수가
+# Σ df²에 비례하므로 기사의 RELATED_MAX_DF 이상에 나오는 term(조사·흔한 바이그램)은 뺀다.
+# scipy.sparse는 쓰지 않는다 — 합산 순서가 달라져 동점 순위가 환경마다 흔들리면 안 된다.
+RELATED_DIR = 'related'
+RELATED_K = 5
+RELATED_MIN_SIM = 0.2
+RELATED_MAX_DF = 0.1
+RELATED_BLOCK = 256
+
+
+def flat_postings(raw):
+    """
+    field_postings의 포스팅을 numpy 배열로 펼친다 → (term 번호, 기사 id, tf 행렬).
+    term 순이고 term 안은 기사 id 순이다.
+    """
+    import numpy as np
+
+    lengths = np.array([len(p) for p in raw.values()], dtype=np.int64)
+    width = len(FIELD_WEIGHTS) + 1
+    flat = np.fromiter((v for p in raw.values() for x in p for v in x), dtype=np.int64,
+                       count=width * int(lengths.sum())).reshape(-1, width)
+    return np.repeat(np.arange(len(lengths)), lengths), flat[:, 0], flat[:, 1:]
+
+
+def score_flat(term, docs, tfs, lens, end):
+    """
+    flat_postings 결과에서 기사 id가 end보다 작은 것만, 그 기사들의 통계로 점수를 매긴다.
+    score_postings와 같은 계산이다 (점수×100 정수). 반환: (term 번호, 기사 id, 점수).
+    """
+    import numpy as np
+
+    keep = docs < end
+    term, docs, tfs = term[keep], docs[keep], tfs[keep]
+    n_docs, avg_len = bm25_stats(lens[:end])
+    df = np.bincount(term)
+    idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))[term]
+    length = np.array(lens[:end], dtype=np.float64)[docs]
+    score = np.zeros(len(docs))
+    for f, (_, weight) in enumerate(FIELD_WEIGHTS):
+        tf = tfs[:, f]
+        norm = 1 - BM25_B + BM25_B * length[:, f] / avg_len[f]
+        part = weight / 10 * idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        score += np.where(tf > 0, part, 0.0)
+    return term, docs, np.maximum(1, np.round(score * 100))
+
+
+def related_articles(rows, term, docs, weight, k=RELATED_K, min_sim=RELATED_MIN_SIM,
+                     max_df=RELATED_MAX_DF, block=RELATED_BLOCK, start=0):
+    """
+    반환: {기사 id: [더 앞선 기사 id, ...]} — 유사도 내림차순(동점은 최근 것 먼저), 같은 파일 제외.
+    term·docs·weight는 score_flat 결과. start 앞의 기사는 후보로만 쓰고 목록을 만들지 않는다.
+    numpy가 필요하다.
+    """
+    import numpy as np
+
+    n = len(rows)
+    limit = max(2, int(max_df * n))
+    keep = np.bincount(term)[term] <= limit
+    term, docs, weight = term[keep], docs[keep], weight[keep].astype(np.float64)
+    if not n or not len(docs):
+        return {}
+    ptr = np.searchsorted(term, term)          # 원소마다 그 term 포스팅의 시작 위치
+
+    norm = np.sqrt(np.bincount(docs, weights=weight * weight, minlength=n))
+    norm[norm == 0] = 1.0
+    weight = weight / norm[docs]
+
+    by_doc = np.argsort(docs, kind='stable')
+    doc_ptr = np.searchsorted(docs[by_doc], np.arange(n + 1))
+    _, file_id = np.unique([row[ARTICLE_FIELDS.index('file')] or '' for row in rows],
+                           return_inverse=True)
+
+    related = {}
+    for r0 in range(start, n, block):
+        r1 = min(n, r0 + block)
+        nz = by_doc[doc_ptr[r0]:doc_ptr[r1]]
+        # 블록 행의 비영 원소마다 그 term 포스팅에서 자기 앞부분(= 더 앞선 기사)만 펼친다.
+        # 포스팅이 기사 id 오름차순이라 앞부분 길이는 포스팅 안에서의 자기 위치다.
+        begin = ptr[nz]
+        counts = nz - begin
+        offset = np.repeat(begin - (np.cumsum(counts) - counts), counts)
+        idx = offset + np.arange(counts.sum())
+        row = np.repeat(docs[nz] - r0, counts)
+        sims = np.bincount(row * n + docs[idx],
+                           weights=np.repeat(weight[nz], counts) * weight[idx],
+                           minlength=(r1 - r0) * n).reshape(r1 - r0, n)
+        sims[file_id[r0:r1, None] == file_id[None, :]] = 0.0
+        for i in range(r1 - r0):
+            cand = np.nonzero(sims[i] >= min_sim)[0]
+            if cand.size:
+                top = cand[np.lexsort((-cand, -sims[i, cand]))][:k]
+                related[r0 + i] = top.tolist()
+    return related
+
+
+def write_related(rows, lens, raw, out_dir=SEARCH_DIR):
+    """
+    search/related/<파일>.json을 쓴다. lens·raw는 field_postings 결과 — 파티션마다 그 달까지의
+    기사로 점수를 다시 매긴다. numpy가 없으면 건너뛴다 (페이지는 파일이 없으면 버튼을 안 그린다).
+    """
+    related = {}
+    try:
+        flat = flat_postings(raw)
+        for _, first, count in partition_bounds(rows):
+            end = first + count
+            related.update(related_articles(rows[:end], *score_flat(*flat, lens, end), start=first))
+    except ImportError:
+        print("[RELATED] numpy 없음 — 관련 기사 생략")
+        rel_dir = os.path.join(out_dir, RELATED_DIR)
+        if os.path.isdir(rel_dir):
+            _prune(rel_dir, {})                 # 예전 결과는 지금 기사 id와 안 맞을 수 있다
+        return
+    col = {f: ARTICLE_FIELDS.index(f) for f in ('date', 'file', 'title', 'anchor')}
+    per_file = {}
+    for aid, ids in related.items():
+        row = rows[aid]
+        if not row[col['anchor']]:
+            continue                            # 페이지에서 카드를 찾을 수 없다
+        entry, seen = per_file.setdefault(row[col['file']], ({'items': {}, 'refs': []}, {}))
+        for other in ids:
+            if other not in seen:
+                seen[other] = len(entry['refs'])
+                entry['refs'].append([rows[other][col[f]] for f in ('date', 'file', 'title', 'anchor')])
+        entry['items'][row[col['anchor']]] = [seen[other] for other in ids]
+
+    rel_dir = os.path.join(out_dir, RELATED_DIR)
+    written = {}
+    for name, (entry, _) in per_file.items():
+        _dump(os.path.join(rel_dir, f'{name}.json'), entry, written)
+    print(f"[RELATED] 관련 기사: {len(related)}건에 이전 보도 연결 (파일 {len(per_file)}개)")
+    _report_writes('RELATED', rel_dir, written, _prune(rel_dir, written) if os.path.isdir(rel_dir) else 0)
+
+
+# ── 같은 기사 묶음 (near-duplicate) ──────────────────────────────
+# 같은 소식이 연일 브리핑·주간 정리에 다시 실린다. 제목·요약을 고쳐 쓰므로 파일 내 제목 비교로는
+# 못 잡는다. 두 단계로 찾는다.
+#   1) 후보: 기사 term 집합(흔한 term 제외)의 MinHash(DUP_BANDS×DUP_ROWS) → 밴드 LSH 버킷이 같고
+#      날짜가 DUP_MAX_DAYS일 이내인 쌍만. 전체 쌍을 보지 않는다.
+#   2) 서명으로 추정한 Jaccard가 DUP_MIN_JACCARD 미만인 후보는 버린다 (벡터 연산 한 번).
+#   3) 확정: 역색인 BM25 벡터(흔한 term 제외)의 코사인이 DUP_MIN_COS 이상.
+# 확정 쌍을 union-find로 묶고 가장 앞선 기사(id 최소)를 대표로 삼는다.
+# 기준값은 아카이브 표본을 눈으로 본 결과 — 코사인 0.5 이상·10일 이내는 전부 같은 소식이었고,
+# 0.4대에는 같은 회사의 다른 소식이 섞였다. 전수 계산한 그런 쌍 425개 중 392개(92%)가 이 경로로
+# 묶인다 — 고쳐 쓴 요약은 term이 적게 겹쳐 Jaccard가 0.08~0.2에 머문다. 밴드를 96개로 늘리면
+# 97%지만 시간이 1.5배다.
+DUP_BANDS = 64
+DUP_ROWS = 2
+DUP_MIN_JACCARD = 0.08
+DUP_MAX_DAYS = 10
+DUP_MIN_COS = 0.5
+_MINHASH_PRIME = (1 << 31) - 1
+
+
+def _doc_term_csr(n, postings, limit):
+    """
+    포스팅이 limit 이하인 term만으로 만든 기사별 희소 벡터 (기사 순 CSR).
+    반환: (ptr, term 번호, L2 정규화 가중치, term 문자열 목록).
+    """
+    import numpy as np
+
+    kept = [(t, p) for t, p in postings.items() if len(p) <= limit]
+    lengths = np.array([len(p) for _, p in kept], dtype=np.int64)
+    flat = np.fromiter((v for _, p in kept for x in p for v in x), dtype=np.int64,
+                       count=2 * int(lengths.sum())).reshape(-1, 2)
+    term = np.repeat(np.arange(len(kept)), lengths)
+    by_doc = np.lexsort((term, flat[:, 0]))
+    doc, term, weight = flat[by_doc, 0], term[by_doc], flat[by_doc, 1].astype(np.float64)
+    norm = np.sqrt(np.bincount(doc, weights=weight * weight, minlength=n))
+    norm[norm == 0] = 1.0
+    return np.searchsorted(doc, np.arange(n + 1)), term, weight / norm[doc], [t for t, _ in kept]
+
+
+def minhash_signatures(ptr, term, names, n_hash, seed=4137, chunk=512):
+    """
+    CSR의 기사별 term 집합 → (기사 수 × n_hash) MinHash 서명. 빈 기사는 전부 소수 P.
+    term 값은 crc32라 실행·환경마다 같다.
+    """
+    import zlib
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MINHASH_PRIME, n_hash, dtype=np.int64)
+    b = rng.integers(0, _MINHASH_PRIME, n_hash, dtype=np.int64)
+    x = np.fromiter((zlib.crc32(t.encode('utf-8')) for t in names), dtype=np.int64, count=len(names))
+    n = len(ptr) - 1
+    sig = np.full((n, n_hash), _MINHASH_PRIME, dtype=np.int64)
+    for d0 in range(0, n, chunk):
+        d1 = min(n, d0 + chunk)
+        lo, hi = ptr[d0], ptr[d1]
+        if lo == hi:
+            continue
+        h = (x[term[lo:hi], None] * a[None, :] + b[None, :]) % _MINHASH_PRIME
+        starts = ptr[d0:d1] - lo
+        filled = starts < np.append(starts[1:], hi - lo)     # term이 하나라도 있는 기사
+        sig[d0:d1][filled] = np.minimum.reduceat(h, starts[filled], axis=0)
+    return sig
+
+
+def _pair_cosines(csr, pairs):
+    """
+    (x, y) 쌍마다 코사인. 두 기사의 (쌍 번호, term) 원소를 이어 붙여 정렬하면 공통 term이
+    이웃한다 — 그 곱의 합이 내적.
+    """
+    import numpy as np
+
+    ptr, term, weight, names = csr
+    if not len(pairs):
+        return np.zeros(0)
+    side = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    owner = np.concatenate([np.arange(len(pairs))] * 2)
+    counts = ptr[side + 1] - ptr[side]
+    idx = np.repeat(ptr[side] - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+    pair_of = np.repeat(owner, counts)
+    key = pair_of * len(names) + term[idx]
+    order = np.argsort(key, kind='stable')
+    key, w = key[order], weight[idx][order]
+    same = np.flatnonzero(key[1:] == key[:-1])
+    return np.bincount(pair_of[order][same], weights=w[same] * w[same + 1], minlength=len(pairs))
+
+
+def near_duplicate_groups(rows, postings, max_df=RELATED_MAX_DF):
+    """
+    반환: 행마다 대표 기사 id (묶음이 있는 기사 — 대표 자신 포함) 또는 None (혼자인 기사).
+    rows·postings는 build_inverted_index 결과. numpy가 필요하다.
+    """
+    from datetime import date
+    import numpy as np
+
+    n = len(rows)
+    col = {f: ARTICLE_FIELDS.index(f) for f in ('date', 'file')}
+    day = [date.fromisoformat(r[col['date']]).toordinal() if r[col['date']] and DATE_RE.match(r[col['date']])
+           else None for r in rows]
+    csr = _doc_term_csr(n, postings, max(2, int(max_df * n)))
+    sig = minhash_signatures(csr[0], csr[1], csr[3], DUP_BANDS * DUP_ROWS)
+
+    candidates = set()
+    for band in range(DUP_BANDS):
+        # 밴드 DUP_ROWS개 값을 정수 하나로 (값 < 2³¹이라 2행이면 int64에 들어간다)
+        key = np.zeros(n, dtype=np.int64)
+        for j in range(band * DUP_ROWS, (band + 1) * DUP_ROWS):
+            key = key * _MINHASH_PRIME + sig[:, j]
+        order = np.argsort(key, kind='stable')
+        edge = np.concatenate(([0], np.flatnonzero(np.diff(key[order])) + 1, [n]))
+        for lo, hi in zip(edge[:-1].tolist(), edge[1:].tolist()):
+            if hi - lo < 2:
+                continue
+            ids = sorted(x for x in order[lo:hi].tolist() if day[x] is not None)
+            # 같은 버킷 안에서 id가 날짜 순이라 앞 기사부터 날짜 창 안의 뒤쪽 기사만 본다
+            for i, x in enumerate(ids):
+                for y in ids[i + 1:]:
+                    if day[y] - day[x] > DUP_MAX_DAYS:
+                        break
+                    if rows[x][col['file']] != rows[y][col['file']]:
+                        candidates.add((x, y))
+
+    pairs = np.array(sorted(candidates), dtype=np.int64).reshape(-1, 2)
+    est = (sig[pairs[:, 0]] == sig[pairs[:, 1]]).mean(axis=1)
+    pairs = pairs[est >= DUP_MIN_JACCARD]
+    cos = _pair_cosines(csr, pairs)
+
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    confirmed = pairs[cos >= DUP_MIN_COS].tolist()
+    for x, y in confirmed:
+        rx, ry = find(x), find(y)
+        if rx != ry:
+            parent[max(rx, ry)] = min(rx, ry)    # 대표 = 가장 앞선 기사
+
+    roots = [find(x) for x in range(n)]
+    sizes = {}
+    for r in roots:
+        sizes[r] = sizes.get(r, 0) + 1
+    groups = sum(1 for c in sizes.values() if c > 1)
+    print(f"[DUP] 후보 {len(candidates)}쌍 → Jaccard 추정 통과 {len(pairs)}쌍 → 확정 {len(confirmed)}쌍 / 묶음 {groups}개 "
+          f"(기사 {sum(c for c in sizes.values() if c > 1)}건)")
+    return [r if sizes[r] > 1 else None for r in roots]
+
+
+# ── 전문 색인 (--full-text) ───────────────────────────────────────
+# 기사 표의 요약은 300자에서 잘리고 deep/<파일>.json 상세 해설은 색인에 없다. 전문 모드는
+# 카드 요약 전체 + 상세 해설을 'text' 필드로 따로 색인해 파티션마다 text/XX.json에 둔다.
+#   search/<YYYY-MM>/text/XX.json : term → base64(varint 열) — (기사 id 차이, tf) 반복
+# 기사 id는 파티션 첫 id부터의 차이(델타)로 적는다. 기사 표·terms/는 전문 모드와 무관하게 같다 —
+# 표시용 데이터는 그대로 작고, 페이지는 검색어가 걸린 샤드의 text/만 더 받는다.
+# 점수는 text 필드 하나의 BM25 × TEXT_WEIGHT/10. df(df/의 "text")·평균 길이는 text 필드 기준으로
+# 따로 잡는다 (terms/ 점수를 그대로 두기 위해서다). 페이지는 두 쪽 점수를 term별로 더한다.
+# 카드 요약 전문·원문 URL은 카드 매니페스트(card_manifest.cards_for)에서 앵커로 찾는다.
+DEEP_DIR = 'deep'
+TEXT_DIR = 'text'
+TEXT_WEIGHT = 2                 # 요약 5, 키워드 3보다 낮게 — 본문 속 언급은 약한 근거
+
+
+def article_texts(articles, archive_dir='archive', deep_dir=DEEP_DIR):
+    """기사별 전문 (articles와 같은 순서). 카드를 못 찾으면 잘린 요약, 해설이 없으면 요약만."""
+    files = {}
+    texts = []
+    for a in articles:
+        name = a.get('file', '')
+        if name not in files:
+            path = os.path.join(archive_dir, name + '.html')
+            cards = {c['id']: c for c in card_manifest.cards_for(path)} if os.path.exists(path) else {}
+            try:
+                with open(os.path.join(deep_dir, name + '.json'), encoding='utf-8') as f:
+                    deep = json.load(f).get('items') or {}
+            except (OSError, ValueError):
+                deep = {}
+            files[name] = (cards, deep)
+        cards, deep = files[name]
+        card = cards.get(a.get('anchor')) or {}
+        parts = [card.get('summary_now') or a.get('summary', '')]
+        item = deep.get(card.get('url') or '')
+        if item and item.get('deep'):
+            parts.append(item['deep'])
+        texts.append('\n'.join(parts))
+    return texts
+
+
+def build_text_postings(texts):
+    """texts(기사 id 순) → (기사별 길이, {term: [[기사 id, tf], ...]}). field_postings의 한 필드판."""
+    from collections import Counter
+
+    tfs = [Counter(index_terms(text)) for text in texts]
+    raw = {}
+    for aid, tf_doc in enumerate(tfs):
+        for term, tf in tf_doc.items():
+            raw.setdefault(term, []).append([aid, tf])
+    return [sum(c.values()) for c in tfs], raw
+
+
+def encode_varints(values):
+    """부호 없는 정수 열 → LEB128 varint 바이트 (7비트씩, 상위 비트는 '더 있음')."""
+    out = bytearray()
+    for v in values:
+        while v >= 0x80:
+            out.append(v & 0x7f | 0x80)
+            v >>= 7
+        out.append(v)
+    return bytes(out)
+
+
+def decode_varints(data):
+    values, v, shift = [], 0, 0
+    for byte in data:
+        v |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            values.append(v)
+            v, shift = 0, 0
+    return values
+
+
+def pack_postings(plist, first):
+    """[[기사 id, tf], ...] (id 오름차순) → base64 문자열. id는 first부터의 차이로 적는다."""
+    import base64
+
+    values, prev = [], first
+    for aid, tf in plist:
+        values += (aid - prev, tf)
+        prev = aid
+    return base64.b64encode(encode_varints(values)).decode('ascii')
+
+
+def unpack_postings(text, first):
+    """pack_postings의 역. search.html decodePostings와 같은 계산이다."""
+    import base64
+
+    values = decode_varints(base64.b64decode(text))
+    plist, aid = [], first
+    for i in range(0, len(values), 2):
+        aid += values[i]
+        plist.append([aid, values[i + 1]])
+    return plist
+
+
+def verify_full(archive_dir='archive', workers=1):
+    """
+    증분 빌드(카드 매니페스트 사용, workers 병렬)와 직렬 전체 빌드(모든 파일 파싱)를 둘 다 돌려 대조한다.
+    반환: 같으면 True. 아무것도 쓰지 않는다.
+    """
+    incremental = build_search_index(archive_dir, incremental=True, workers=workers)
+    full = build_search_index(archive_dir)
+    for index in (incremental, full):
+        index.pop('updated')
+    same = incremental == full and build_inverted_index(incremental['articles']) == \
+        build_inverted_index(full['articles'])
+    print(f"[VERIFY] 증분 빌드 == 전체 빌드: {'일치' if same else '불일치'} (기사 {full['total']}건)")
+    if not same:
+        for i, (a, b) in enumerate(zip(incremental['articles'], full['articles'])):
+            if a != b:
+                print(f"[VERIFY] 첫 차이: #{i} {b.get('file')} {b.get('title', '')[:40]}")
+                break
+    return same
+
+
+def parse_args(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="archive/*.html → search-index.json + search/ 역색인")
+    ap.add_argument('--incremental', action='store_true',
+                    help=f"카드 매니페스트({card_manifest.CARDS_JSON.name})에 구워진 기사 목록을 쓰고 "
+                         "매니페스트에 없거나 내용이 바뀐 파일만 파싱한다")
+    ap.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                    help="파싱 프로세스 수 (1이면 직렬). 결과 순서는 직렬과 같다")
+    ap.add_argument('--drop-dup-summaries', action='store_true',
+                    help="search/ 기사 표에서 같은 기사 묶음의 대표가 아닌 기사 요약을 비운다")
+    ap.add_argument('--full-text', action='store_true',
+                    help="카드 요약 전문과 deep/ 상세 해설도 색인한다 (search/<달>/text/, varint 포스팅)")
+    ap.add_argument('--verify-full', action='store_true',
+                    help="증분·병렬 빌드와 직렬 전체 빌드를 대조만 하고 끝낸다 (불일치 시 종료 코드 1)")
+    return ap.parse_args(argv)
+
+
+def main(argv=None):
     """Main entry point."""
+    args = parse_args(argv)
+    if args.verify_full:
+        raise SystemExit(0 if verify_full('archive', args.workers) else 1)
+
     print("Building search index (v4 - universal format support)...")
     print("=" * 50)
     
-    index = build_search_index('archive')
+    index = build_search_index('archive', incremental=args.incremental, workers=args.workers)
     
     output_file = 'search-index.json'
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(index, f, ensure_ascii=False, indent=2)
+        f.write(json.dumps(index, ensure_ascii=False, indent=2))
+    write_related(*write_inverted_index(index, drop_dup_summaries=args.drop_dup_summaries,
+                                        full_text=args.full_text))
     
     print("=" * 50)
     print(f"Search index created: {output_file}")
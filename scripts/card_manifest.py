@@ -0,0 +1,306 @@
+"""
+카드 매니페스트 (data/cards.json) — post_process.py가 DOM을 들고 있을 때 구워 두는 카드 데이터
+
+아카이브 HTML을 다시 파싱하던 곳들이 이 파일을 읽는다.
+  · deep_extract.collect / deep_generate.collect_cards / deep_pilot.collect_cards
+      → "cards": normalize_cards가 붙인 id·data-card-url·data-card-title + 한글 제목·요약
+  · build_search_index.parse_briefing_file
+      → "search": BriefingParser가 뽑는 기사 목록 (검색 인덱스 휴리스틱 그대로)
+        post_process는 HTML을 다시 파싱하지 않고 들고 있는 DOM을 파서에 흘려 넣는다 (soup_search)
+
+형식: {"_code": 레코드를 만든 코드의 해시, "<파일명>": {"html": 기록한 HTML의 sha256, "cards": [...], "search": [...]}}
+파일 내용의 해시가 "html"과 다르면(Drive 동기화가 post_process 이후에 덮어쓴 경우 등)
+그 항목은 무시하고 예전처럼 HTML을 파싱한다 — 매니페스트는 캐시일 뿐 원본이 아니다.
+"_code"가 지금 코드(code_version — BriefingParser·card_record 소스)와 다르면 매니페스트 전체를
+낡은 것으로 본다. HTML이 그대로여도 파서가 바뀌면 레코드가 달라지기 때문이다.
+
+검증: python scripts/card_manifest.py — 매니페스트 항목과 HTML 재파싱 결과를 전수 대조
+"""
+import hashlib
+import json
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+
+ROOT_DIR   = Path(__file__).resolve().parent.parent
+CARDS_JSON = ROOT_DIR / "data" / "cards.json"
+CODE_KEY   = "_code"                  # 파일명(*.html)과 겹치지 않는 키
+
+_loaded = None
+_code = None
+
+
+class BriefingParser(HTMLParser):
+    """Parse briefing HTML to extract articles - handles all format versions."""
+    
+    def __init__(self):
+        super().__init__()
+        self.articles = []
+        self.current_section = ""
+        self.is_claudes_pick = False
+        
+        # Current article being built
+        self.pending_title = ""
+        self.pending_title_kr = ""
+        self.pending_summary = ""
+        
+        # Tag state
+        self.in_h2 = False
+        self.in_h3 = False
+        self.in_p = False
+        self.current_class = ""
+        self.current_text = ""
+        
+        # Track if we're inside an article tag
+        self.in_article_tag = False
+
+        # post_process.py가 구워둔 카드 앵커(id="art-N"). 순번을 추정하지 않는다.
+        self.current_anchor = None
+        
+    def _save_pending_article(self):
+        """Save the pending article if it has required fields."""
+        title = self.pending_title_kr or self.pending_title
+        summary = self.pending_summary
+        
+        if title and summary and len(summary) > 20:
+            self.articles.append({
+                'title': title.strip(),
+                'summary': summary.strip()[:300],
+                'section': self.current_section,
+                'is_pick': self.is_claudes_pick,
+                'anchor': self.current_anchor
+            })
+        
+        # Reset pending
+        self.pending_title = ""
+        self.pending_title_kr = ""
+        self.pending_summary = ""
+        
+    def handle_starttag(self, tag, attrs):
+        attrs_dict = dict(attrs)
+        self.current_class = attrs_dict.get('class', '')
+
+        # 카드 경계는 태그 이름이 아니라 정규화된 id로 잡는다.
+        # 주간·초기판은 <article>이 아니라 <div>를 쓰므로 이쪽이 모든 세대에 통한다.
+        el_id = attrs_dict.get('id', '')
+        if el_id.startswith('art-'):
+            self._save_pending_article()
+            self.current_anchor = el_id
+
+        if tag == 'article':
+            self.in_article_tag = True
+            # Save any pending article before starting new one
+            self._save_pending_article()
+            
+        if tag == 'h2':
+            self.in_h2 = True
+            self.current_text = ""
+            
+        if tag == 'h3':
+            # New h3 means new article - save previous if exists
+            if self.pending_title and not self.in_article_tag:
+                self._save_pending_article()
+            self.in_h3 = True
+            self.current_text = ""
+            
+        if tag == 'p':
+            self.in_p = True
+            self.current_text = ""
+                
+    def handle_endtag(self, tag):
+        if tag == 'article':
+            self.in_article_tag = False
+            self._save_pending_article()
+            
+        if tag == 'h2' and self.in_h2:
+            self.in_h2 = False
+            section = self.current_text.strip()
+            self.current_section = section
+            
+            # Detect Claude's Pick section
+            pick_keywords = ["Claude's Pick", "클로드", "💎", "Pick", "PICK"]
+            section_keywords = ["TOP", "🔥", "AI", "🤖", "경제", "💰", "반도체", "💾", "글로벌", "🌏", "🌐", "Headlines", "기술"]
+            
+            if any(x in section for x in pick_keywords):
+                self.is_claudes_pick = True
+            elif any(x in section for x in section_keywords):
+                self.is_claudes_pick = False
+                
+            self.current_text = ""
+            
+        if tag == 'h3' and self.in_h3:
+            self.in_h3 = False
+            title = self.current_text.strip()
+            # Remove badges
+            title = re.sub(r'\s*(HOT|NEW|PICK)\s*$', '', title).strip()
+            
+            if title:
+                # Check if this is Korean title based on class or content
+                if 'kr' in self.current_class.lower():
+                    self.pending_title_kr = title
+                elif re.search(r'[가-힣]', title):
+                    # Contains Korean characters
+                    self.pending_title_kr = title
+                else:
+                    self.pending_title = title
+                    
+            self.current_class = ""
+            self.current_text = ""
+            
+        if tag == 'p' and self.in_p:
+            self.in_p = False
+            text = self.current_text.strip()
+            text = re.sub(r'\s+', ' ', text)
+            
+            if text and len(text) > 15:
+                # Determine what this paragraph is
+                if 'title-kr' in self.current_class or 'article-title-kr' in self.current_class:
+                    self.pending_title_kr = text
+                elif 'summary' in self.current_class:
+                    self.pending_summary = text
+                elif not self.pending_summary and (self.pending_title or self.pending_title_kr):
+                    # First substantial paragraph after title is summary
+                    # Skip if it looks like metadata (sources, dates)
+                    if not re.match(r'^(TechCrunch|Bloomberg|CNBC|BBC|Wired|Reuters|📅|Score:)', text):
+                        self.pending_summary = text
+                        
+            self.current_class = ""
+            self.current_text = ""
+            
+    def handle_data(self, data):
+        if self.in_h2 or self.in_h3 or self.in_p:
+            self.current_text += data
+            
+    def get_articles(self):
+        # Save any remaining pending article
+        self._save_pending_article()
+        return self.articles
+
+
+
+def _txt(el):
+    return re.sub(r"\s+", " ", el.get_text(" ", strip=True)).strip() if el else ""
+
+
+def card_record(c) -> dict:
+    """.jfnb-card 요소 하나 → 매니페스트 레코드. 세 deep 스크립트가 읽던 필드 그대로."""
+    return {
+        "id":          c.get("id", ""),
+        "url":         c.get("data-card-url", ""),
+        "title_en":    c.get("data-card-title", ""),
+        "title_kr":    _txt(c.select_one(".article-title-kr, .title-kr")),
+        "summary_now": _txt(c.select_one(".article-summary")),
+    }
+
+
+def soup_cards(soup) -> list:
+    return [card_record(c) for c in soup.select(".jfnb-card")]
+
+
+def soup_search(soup) -> list:
+    """
+    BriefingParser에 HTML 문자열 대신 DOM을 흘려 넣는다 — str(soup)를 feed한 결과와 같다.
+    직렬화본을 토크나이저가 읽으면 트리 순회와 같은 순서로 시작·끝 태그와 텍스트가 나오기 때문이다.
+    (void 요소는 <br/>로 직렬화돼 시작·끝이 둘 다 오고, 주석·doctype·CDATA는 handle_data로 가지 않는다)
+    """
+    from bs4.element import NavigableString, PreformattedString, Tag
+    parser = BriefingParser()
+    stack = [(None, iter(soup.contents))]          # 재귀 대신 스택 — 닫히지 않은 태그로 깊어진 옛 HTML 대비
+    while stack:
+        tag, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            if tag is not None:
+                parser.handle_endtag(tag.name)
+        elif isinstance(child, Tag):
+            parser.handle_starttag(child.name, [(k, " ".join(v) if isinstance(v, list) else v)
+                                                for k, v in child.attrs.items()])
+            stack.append((child, iter(child.contents)))
+        elif isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
+            parser.handle_data(str(child))
+    return parser.get_articles()
+
+
+def parse_search(html_text: str) -> list:
+    """매니페스트가 없거나 낡았을 때의 폴백 — HTML 문자열을 BriefingParser로 파싱한다."""
+    parser = BriefingParser()
+    parser.feed(html_text)
+    return parser.get_articles()
+
+
+def parse_cards(html_text: str) -> list:
+    """매니페스트가 없거나 낡았을 때의 폴백 — 예전 방식대로 HTML을 파싱한다."""
+    from bs4 import BeautifulSoup
+    return soup_cards(BeautifulSoup(html_text, "html.parser"))
+
+
+def code_version() -> str:
+    """레코드를 만드는 코드의 해시 — "search"는 BriefingParser, "cards"는 card_record가 만든다."""
+    global _code
+    if _code is None:
+        import inspect
+        src = "\0".join(inspect.getsource(o) for o in (BriefingParser, soup_search, _txt, card_record, soup_cards))
+        _code = hashlib.sha256(src.encode("utf-8")).hexdigest()
+    return _code
+
+
+def load() -> dict:
+    """매니페스트 항목 {파일명: 항목}. 다른 코드로 구운 매니페스트면 빈 dict."""
+    global _loaded
+    if _loaded is None:
+        try:
+            _loaded = json.loads(CARDS_JSON.read_text("utf-8"))
+        except (OSError, ValueError):
+            _loaded = {}
+        if _loaded.pop(CODE_KEY, None) != code_version():
+            _loaded = {}
+    return _loaded
+
+
+def fresh_entry(html_path, html_text: str | None = None) -> dict | None:
+    """html_path의 매니페스트 항목. 파일 내용이 구울 때와 다르면 None."""
+    html_path = Path(html_path)
+    entry = load().get(html_path.name)
+    if not entry:
+        return None
+    if html_text is None:
+        try:
+            html_text = html_path.read_text("utf-8")
+        except OSError:
+            return None
+    if hashlib.sha256(html_text.encode("utf-8")).hexdigest() != entry.get("html"):
+        return None
+    return entry
+
+
+def cards_for(html_path) -> list:
+    """html_path의 카드 레코드 목록 (문서 순). 매니페스트 우선, 없으면 파싱."""
+    html_text = Path(html_path).read_text("utf-8")
+    entry = fresh_entry(html_path, html_text)
+    if entry is not None:
+        return entry["cards"]
+    return parse_cards(html_text)
+
+
+def verify(archive_dir=None) -> int:
+    """매니페스트의 cards·search가 HTML 재파싱 결과와 같은지 전수 대조. 반환: 불일치 파일 수."""
+    archive_dir = Path(archive_dir or ROOT_DIR / "archive")
+    fresh = stale = bad = 0
+    for html_path in sorted(archive_dir.glob("*.html")):
+        text = html_path.read_text("utf-8")
+        entry = fresh_entry(html_path, text)
+        if entry is None:
+            stale += 1
+            continue
+        fresh += 1
+        if entry["cards"] != parse_cards(text) or entry["search"] != parse_search(text):
+            bad += 1
+            print(f"[CARDS] 불일치 {html_path.name}")
+    print(f"[CARDS] 매니페스트 유효 {fresh}개 / 없음·낡음 {stale}개 / 불일치 {bad}개")
+    return bad
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(1 if verify(*sys.argv[1:2]) else 0)
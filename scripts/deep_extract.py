@@ -15,28 +15,24 @@
 
 저장소에 아무것도 쓰지 않는다.
 """
-import os, re, json, time, random, sys
+import os, re, json, sys
 from collections import Counter, defaultdict
-from concurrent.futures import ThreadPoolExecutor
-from urllib.parse import urlparse
 from pathlib import Path
 from threading import Lock
 
-import requests
-from bs4 import BeautifulSoup
+import article_fetch
+import card_manifest
+import fetch_cache
+from article_fetch import domain_of
 
-DAYS      = int(os.environ.get("EXTRACT_DAYS", "30"))
-MIN_BODY  = int(os.environ.get("EXTRACT_MIN_BODY", "1200"))   # 환각 게이트
-BODY_CAP  = int(os.environ.get("EXTRACT_BODY_CAP", "12000"))  # JSON 비대 방지
-WORKERS   = int(os.environ.get("EXTRACT_WORKERS", "4"))
-
-UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-      "(KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36")
-HEADERS = {
-    "User-Agent": UA,
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Language": "en-US,en;q=0.9",
-}
+DAYS       = int(os.environ.get("EXTRACT_DAYS", "30"))
+MIN_BODY   = int(os.environ.get("EXTRACT_MIN_BODY", "1200"))   # 환각 게이트
+BODY_CAP   = int(os.environ.get("EXTRACT_BODY_CAP", "12000"))  # JSON 비대 방지
+WORKERS    = int(os.environ.get("EXTRACT_WORKERS", "16"))      # 전체 동시 요청
+PER_DOMAIN = int(os.environ.get("EXTRACT_PER_DOMAIN", "3"))    # 매체별 동시 요청
+DOMAIN_GAP = float(os.environ.get("EXTRACT_DOMAIN_GAP", "0.25"))  # 같은 매체 요청 간격(초)
+PROCS      = int(os.environ.get("EXTRACT_PROCS") or os.cpu_count() or 1)  # 본문 추출 프로세스
+QUEUE      = int(os.environ.get("EXTRACT_QUEUE", "16"))        # 받기 → 추출 큐 크기
 
 ROOT = Path(__file__).resolve().parent.parent
 OUT  = ROOT / "out"
@@ -46,10 +42,6 @@ DAILY_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.html$")
 _print_lock = Lock()
 
 
-def _txt(el):
-    return re.sub(r"\s+", " ", el.get_text(" ", strip=True)).strip() if el else ""
-
-
 # ── 1. 대상 수집 ───────────────────────────────────────────────────
 def collect(days):
     """최근 N일 일간 브리핑. 같은 원문 URL이 여러 날 등장하면 최신 1건만 남긴다."""
@@ -71,67 +63,39 @@ def collect(days):
     if done:
         print(f"  기존 해설 {len(done)}건 — 건너뜀")
 
+    # 카드는 post_process가 구워 둔 data/cards.json에서 읽는다 (낡았으면 HTML 파싱 폴백)
     out, seen = [], set()
     for date, f in files:
-        soup = BeautifulSoup(f.read_text(encoding="utf-8"), "html.parser")
-        for c in soup.select(".jfnb-card"):
-            url = c.get("data-card-url", "")
+        for c in card_manifest.cards_for(f):
+            url = c["url"]
             if not url or url in seen or url in done:
                 continue
             seen.add(url)
             out.append({
                 "date": date,
                 "file": f.name,
-                "id": c.get("id", ""),
+                "id": c["id"],
                 "url": url,
-                "domain": urlparse(url).netloc.replace("www.", ""),
-                "title_en": c.get("data-card-title", "")[:200],
-                "title_kr": _txt(c.select_one(".article-title-kr, .title-kr")),
-                "summary_now": _txt(c.select_one(".article-summary")),
+                "domain": domain_of(url),
+                "title_en": c["title_en"][:200],
+                "title_kr": c["title_kr"],
+                "summary_now": c["summary_now"],
             })
     return files, out
 
 
 # ── 2. 본문 추출 ───────────────────────────────────────────────────
-def extract(url):
-    try:
-        r = requests.get(url, headers=HEADERS, timeout=25, allow_redirects=True)
-    except Exception as e:
-        return "", f"net:{type(e).__name__}"
-    if r.status_code != 200:
-        return "", f"http:{r.status_code}"
-
-    body = ""
-    try:
-        import trafilatura
-        body = trafilatura.extract(
-            r.text, include_comments=False, include_tables=False,
-            favor_precision=True, url=url) or ""
-    except Exception:
-        pass
-
-    if len(body) < 400:                       # 폴백 — 문단 태그 직접 수집
-        soup = BeautifulSoup(r.text, "html.parser")
-        for bad in soup.select("script,style,nav,footer,header,aside,form"):
-            bad.decompose()
-        alt = "\n".join(p for p in (_txt(p) for p in soup.find_all("p")) if len(p) > 60)
-        if len(alt) > len(body):
-            body = alt
-
-    body = re.sub(r"\n{3,}", "\n\n", body).strip()
-    return (body, "ok") if body else ("", "empty")
-
-
-def work(a, i, n):
-    time.sleep(random.uniform(0.2, 0.9))      # 같은 매체에 몰리지 않게
-    body, why = extract(a["url"])
+# 받기·본문 추출·캐시는 article_fetch가 한다 — 받기는 asyncio·연결 풀·매체별 상한, 추출은 프로세스 풀,
+# 둘 사이는 크기 EXTRACT_QUEUE의 큐. 캐시는 .cache/fetch.
+def work(a, body, why, progress):
     a["body"] = body[:BODY_CAP]
     a["state"] = ("extract_fail" if why != "ok"
                   else "too_short" if len(body) < MIN_BODY
                   else "ready")
     a["why"] = why
     with _print_lock:
-        print(f"  [{i+1:4d}/{n}] {a['date']} {a['domain']:<18} "
+        progress[0] += 1
+        print(f"  [{progress[0]:4d}/{progress[1]}] {a['date']} {a['domain']:<18} "
               f"{len(body):>6}자  {a['state']}", flush=True)
     return a
 
@@ -147,11 +111,17 @@ def main():
     print(f"  파일 {len(files)}개 ({files[-1][0]} ~ {files[0][0]}) · 고유 원문 {len(arts)}건\n",
           flush=True)
 
-    print(f"■ 본문 추출 (동시 {WORKERS})", flush=True)
-    t0 = time.time()
-    with ThreadPoolExecutor(max_workers=WORKERS) as ex:
-        arts = list(ex.map(lambda p: work(p[1], p[0], len(arts)), enumerate(arts)))
-    print(f"\n  {time.time()-t0:.0f}초 소요\n", flush=True)
+    print(f"■ 본문 추출 (받기 동시 {WORKERS} · 매체별 {PER_DOMAIN} · 간격 {DOMAIN_GAP}초 / "
+          f"추출 프로세스 {PROCS} · 큐 {QUEUE})", flush=True)
+    progress = [0, len(arts)]
+    results, stats = article_fetch.fetch_bodies(
+        [a["url"] for a in arts], lambda i, body, why: work(arts[i], body, why, progress),
+        cache=fetch_cache.open_default(), concurrency=WORKERS, per_domain=PER_DOMAIN, gap=DOMAIN_GAP,
+        procs=PROCS, queue_depth=QUEUE)
+    for a, got in zip(arts, results):
+        if got is not a:                       # work가 끝내 실패한 기사 — ("", "handler:<예외>")
+            a.update(body="", state="extract_fail", why=got[1])
+    print(f"\n  {article_fetch.summary(stats)}\n", flush=True)
 
     # 날짜별로 쪼개 저장 — 해설 작성 단계에서 조금씩 받아가기 좋게
     by_date = defaultdict(list)
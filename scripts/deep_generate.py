@@ -16,25 +16,37 @@
      미대조 수치·고유명사가 하나라도 있으면 그 기사는 아예 만들지 않는다.
   6) 기사별 목표 글자수를 원문 길이에서 계산해 프롬프트에 넣는다.
      (사람이 쓸 때도 초고가 목표의 1.4~1.8배로 나왔다. 미리 못 박는다.)
+  7) 본문 추출·생성·검증을 겹쳐 돌린다. 추출된 기사가 배치만큼 모이면 바로 Gemini에
+     보내고, 검증(gate·수리)은 다음 호출 자리를 기다리는 동안 따로 돈다.
+     호출 간격(DEEP_RPM_GAP)은 한도 장부 한 곳에서 지킨다. DEEP_PIPELINE=0이면 차례로.
+  8) Gemini 한도를 실행 사이에 이어서 센다 (gemini_quota.py — .cache/gemini/quota.json).
+     오늘 남은 요청으로 만들 수 있는 만큼만 페이지 위쪽 카드부터 고르고,
+     한도가 없으면 원문을 받기 전에 멈춘다. 일 한도 429는 기다리지 않고 끝낸다.
+     한도로 못 만든 카드는 deep/{날짜}.json의 "pending"에 남겨 다음 실행이 이어 만든다.
 
 안전
   · 건드리는 파일은 deep/{날짜}.json 뿐이다. archive·data·briefings.json 무관.
   · 이미 deep/{날짜}.json이 있으면 그 날짜는 건너뛴다 (중복 호출·한도 낭비 방지).
+    "pending"이 남은 날짜만 예외 — 그 카드들만 다시 만든다.
   · 같은 원문 URL의 해설이 다른 날짜에 이미 있으면 재사용한다 (한도 절약).
-  · DEEP_MAX_REQUESTS로 Gemini 호출 수에 상한을 둔다 (무료 등급 Flash 20 RPD).
+  · DEEP_MAX_REQUESTS로 한 실행의 Gemini 호출 수에 상한을 둔다.
+    같은 날 앞 실행들이 쓴 몫은 장부로 빼고 센다 (GEMINI_RPD, 무료 등급 Flash 20).
   · DEEP_DRY_RUN=1 이면 Gemini를 부르지 않고 파이프라인만 점검한다.
 """
-import os, re, sys, json, time, random
+import os, re, sys, json, time, queue, threading
 from collections import defaultdict
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
-from bs4 import BeautifulSoup
 
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT / "scripts"))
 import verify_deep as V                      # 검증 로직 재사용
+import card_manifest                         # post_process가 구운 카드 데이터
+import article_fetch                         # 원문 받기·본문 추출 (deep_extract와 공용)
+import fetch_cache
+import gemini_quota                          # 실행 사이에 이어지는 RPD·RPM 장부
 
 # ── 설정 ───────────────────────────────────────────────────────────
 API_KEY      = os.environ.get("GEMINI_API_KEY", "")
@@ -43,7 +55,9 @@ BATCH        = int(os.environ.get("DEEP_BATCH", "2"))
 MIN_BODY     = int(os.environ.get("DEEP_MIN_BODY", "1200"))
 BODY_CAP     = int(os.environ.get("DEEP_BODY_CAP", "12000"))
 MAX_DATES    = int(os.environ.get("DEEP_MAX_DATES", "1"))
-MAX_REQUESTS = int(os.environ.get("DEEP_MAX_REQUESTS", "18"))   # Flash 무료 20 RPD
+MAX_REQUESTS = int(os.environ.get("DEEP_MAX_REQUESTS", "18"))   # 한 실행 상한 (일 한도는 장부)
+RESERVE      = int(os.environ.get("DEEP_QUOTA_RESERVE", "2"))   # 계획에서 빼 두는 수리·재시도 몫
+RETRY_COST   = float(os.environ.get("DEEP_RETRY_COST", "0.5"))  # 배치당 추가 호출 예상 (쪼개기·수리·분당 429)
 TARGET_RATIO = float(os.environ.get("DEEP_TARGET_RATIO", "0.28"))
 LEN_MIN, LEN_MAX = 700, 2100
 LEN_HARD_MAX = int(os.environ.get("DEEP_LEN_HARD_MAX", "2300"))  # 장문 예외 허용치
@@ -51,22 +65,14 @@ RPM_GAP      = float(os.environ.get("DEEP_RPM_GAP", "13"))       # Flash 5 RPM 
 DRY_RUN      = os.environ.get("DEEP_DRY_RUN", "") == "1"
 ONLY_DATE    = os.environ.get("DEEP_DATE", "").strip()
 BODIES_DIR   = os.environ.get("DEEP_BODIES_DIR", "").strip()   # 있으면 bodies-{날짜}.json 재사용
+PIPELINE     = os.environ.get("DEEP_PIPELINE", "1") != "0"     # 0이면 추출 → 생성 → 검증을 차례로
 
 DEEP_DIR = ROOT / "deep"
 DEEP_DIR.mkdir(exist_ok=True)
 
-UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-      "(KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36")
-HEADERS = {"User-Agent": UA,
-           "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-           "Accept-Language": "en-US,en;q=0.9"}
-
 DAILY_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.html$")
-_requests_used = 0
-
-
-def _txt(el):
-    return re.sub(r"\s+", " ", el.get_text(" ", strip=True)).strip() if el else ""
+QUOTA = gemini_quota.QuotaLedger(MODEL, gap=RPM_GAP, run_cap=MAX_REQUESTS)
+QUOTA_OUT = ("budget-exhausted", "quota-day")     # call_gemini가 한도 때문에 못 보냈을 때의 사유
 
 
 # ── 1. 대상 날짜 고르기 ────────────────────────────────────────────
@@ -79,10 +85,22 @@ def target_dates():
     dates.sort(reverse=True)
     if ONLY_DATE:
         return [(d, f) for d, f in dates if d == ONLY_DATE][:1]
-    out = [(d, f) for d, f in dates if not (DEEP_DIR / f"{d}.json").exists()]
+    # 파일이 있어도 한도로 미룬 카드(pending)가 남았으면 다시 대상
+    out = [(d, f) for d, f in dates if pending_urls(d) != set()]
     return out[:MAX_DATES]
 
 
+def pending_urls(date):
+    """deep/{날짜}.json의 pending — 한도 때문에 만들지 못한 카드 URL. 파일이 없으면 None."""
+    p = DEEP_DIR / f"{date}.json"
+    if not p.exists():
+        return None
+    try:
+        return set(json.loads(p.read_text(encoding="utf-8")).get("pending", []))
+    except Exception:
+        return set()
+
+
 def existing_deep_by_url():
     """다른 날짜에 이미 있는 해설 — 같은 원문이면 재사용해 한도를 아낀다."""
     got = {}
@@ -98,48 +116,27 @@ def existing_deep_by_url():
 
 # ── 2. 카드 수집 ───────────────────────────────────────────────────
 def collect_cards(path):
-    soup = BeautifulSoup(path.read_text(encoding="utf-8"), "html.parser")
+    """post_process가 구워 둔 data/cards.json에서 읽는다 (낡았으면 HTML 파싱 폴백)."""
     cards, seen = [], set()
-    for c in soup.select(".jfnb-card"):
-        url = c.get("data-card-url", "")
+    for c in card_manifest.cards_for(path):
+        url = c["url"]
         if not url or url in seen:
             continue
         seen.add(url)
         cards.append({
-            "id": c.get("id", ""),
+            "id": c["id"],
             "url": url,
-            "domain": urlparse(url).netloc.replace("www.", ""),
-            "title_en": c.get("data-card-title", "")[:200],
-            "title_kr": _txt(c.select_one(".article-title-kr, .title-kr")),
-            "summary_now": _txt(c.select_one(".article-summary")),
+            "domain": article_fetch.domain_of(url),
+            "title_en": c["title_en"][:200],
+            "title_kr": c["title_kr"],
+            "summary_now": c["summary_now"],
         })
     return cards
 
 
-# ── 3. 본문 추출 (deep_extract.py와 동일 로직) ─────────────────────
-def extract(url):
-    try:
-        r = requests.get(url, headers=HEADERS, timeout=25, allow_redirects=True)
-    except Exception as e:
-        return "", f"net:{type(e).__name__}"
-    if r.status_code != 200:
-        return "", f"http:{r.status_code}"
-    body = ""
-    try:
-        import trafilatura
-        body = trafilatura.extract(r.text, include_comments=False, include_tables=False,
-                                   favor_precision=True, url=url) or ""
-    except Exception:
-        pass
-    if len(body) < 400:
-        soup = BeautifulSoup(r.text, "html.parser")
-        for bad in soup.select("script,style,nav,footer,header,aside,form"):
-            bad.decompose()
-        alt = "\n".join(p for p in (_txt(p) for p in soup.find_all("p")) if len(p) > 60)
-        if len(alt) > len(body):
-            body = alt
-    body = re.sub(r"\n{3,}", "\n\n", body).strip()
-    return (body, "ok") if body else ("", "empty")
+# ── 3. 본문 추출 ───────────────────────────────────────────────────
+# article_fetch를 deep_extract와 같이 쓴다. 캐시(.cache/fetch)에 있으면 네트워크에 가지 않는다 —
+# Gemini 단계에서 실패해 다시 돌려도 원문을 다시 받지 않는다.
 
 
 # ── 4. 프롬프트 (확정 규격) ────────────────────────────────────────
@@ -226,10 +223,10 @@ def build_prompt(batch):
 ENDPOINT = "https://generativelanguage.googleapis.com/v1beta/models/{m}:generateContent"
 
 def call_gemini(prompt, tries=3):
-    """반환: (파싱된 리스트 or None, 사유). 사유 'truncated'면 배치를 쪼개 재시도."""
-    global _requests_used
-    if _requests_used >= MAX_REQUESTS:
-        return None, "budget-exhausted"
+    """
+    반환: (파싱된 리스트 or None, 사유). 사유 'truncated'면 배치를 쪼개 재시도.
+    자리는 QUOTA에서 받는다 — 한도가 없으면 'budget-exhausted', 일 한도 429면 'quota-day'.
+    """
     payload = {
         "systemInstruction": {"parts": [{"text": SYSTEM}]},
         "contents": [{"role": "user", "parts": [{"text": prompt}]}],
@@ -242,7 +239,10 @@ def call_gemini(prompt, tries=3):
     }
     last = ""
     for k in range(tries):
-        _requests_used += 1
+        call = QUOTA.acquire()
+        if call is None:
+            # 앞선 시도가 분당 429·네트워크 오류였어도 이번에 못 보낸 이유는 한도다 — 카드를 대기열에 남긴다
+            return None, "budget-exhausted"
         try:
             r = requests.post(ENDPOINT.format(m=MODEL),
                               headers={"x-goog-api-key": API_KEY,
@@ -250,17 +250,28 @@ def call_gemini(prompt, tries=3):
                               json=payload, timeout=240)
         except Exception as e:
             last = f"net:{type(e).__name__}"
+            QUOTA.record(call, last)
             time.sleep(5 * (k + 1)); continue
 
         if r.status_code == 429:
-            wait = 20 * (k + 1) + random.uniform(0, 5)
-            print(f"    429 — {wait:.0f}초 대기 후 재시도 ({k+1}/{tries})", flush=True)
-            last = "429"; time.sleep(wait); continue
+            scope, delay = gemini_quota.classify_429(r.text)
+            QUOTA.record(call, f"429:{scope}")
+            if scope == "day":
+                QUOTA.exhaust()
+                print(f"    429 — 오늘 일 한도 소진. 리셋까지 {gemini_quota.reset_in() / 3600:.1f}시간",
+                      flush=True)
+                return None, "quota-day"
+            wait = delay or 20 * (k + 1)
+            print(f"    429 — 분당 한도. {wait:.0f}초 뒤 재시도 ({k+1}/{tries})", flush=True)
+            QUOTA.penalize(wait)
+            last = "429"; continue
         if r.status_code != 200:
+            QUOTA.record(call, f"http:{r.status_code}")
             return None, f"http:{r.status_code} {r.text[:200]}"
 
         try:
             j = r.json()
+            QUOTA.record(call, "ok", j.get("usageMetadata"))
             cands = j.get("candidates") or []
             if not cands:
                 return None, "no-candidate"
@@ -298,10 +309,10 @@ def generate(batch):
 
     if len(batch) == 1:
         return got, why
+    why = "ok"
     for a in batch:
         if got.get(a["i"]):
             continue
-        time.sleep(RPM_GAP)
         d, w = call_gemini(build_prompt([a]))
         if d:
             for o in d:
@@ -309,7 +320,9 @@ def generate(batch):
                     got[a["i"]] = o["deep"]
         else:
             print(f"      기사 {a['i']} 실패 — {w}", flush=True)
-    return got, "ok"
+            if w in QUOTA_OUT:
+                why = w
+    return got, why
 
 
 # ── 6. 검증 게이트 ─────────────────────────────────────────────────
@@ -375,6 +388,122 @@ def repair(a, deep, reasons):
 
 
 # ── 7. 실행 ────────────────────────────────────────────────────────
+# 파이프라인 (기본)
+#   추출 — 스레드 하나가 article_fetch로 받으며 ready 카드를 큐에 흘린다
+#   생성 — 큐에 BATCH건이 모이는 대로(추출이 끝났으면 남은 것만으로) Gemini에 보낸다
+#   검증 — gate·수리는 검증 스레드가 맡는다. 생성 쪽이 다음 호출 자리를 기다리는 동안 돈다
+# 호출 간격은 QUOTA 한 곳에서 지키므로 단계가 겹쳐도 RPM을 넘지 않는다.
+# 날짜 하나의 벽시계가 단계별 시간의 합이 아니라 'Gemini 호출 수 × RPM_GAP'에 가까워진다.
+# DEEP_PIPELINE=0이면 예전 순서(추출을 다 끝낸 뒤 생성, 배치마다 바로 검증)로 돈다.
+#
+# 한도가 모자라면 want건만 만든다. 고르는 기준은 페이지 순서(위쪽 카드가 그날의 주요 기사)다.
+# 카드는 '앞쪽에 아직 추출 중이거나 ready인 카드가 want건 미만'일 때만 큐로 나간다 —
+# 앞 카드가 추출에 실패하면 그 자리가 다음 카드로 넘어간다. 끝까지 못 나간 카드는 deferred.
+def stream_ready(todo, cached, want=None):
+    """추출 스레드를 띄운다. 반환: (ready 카드가 하나씩 들어오는 큐 — 끝나면 None, 스레드)."""
+    ready_q = queue.Queue()
+    lock = threading.Lock()
+    done = [0]
+    want = len(todo) if want is None else want
+
+    def release():
+        ahead = 0
+        for c in todo:
+            if ahead >= want:
+                break
+            if c.get("state") in ("extract_fail", "too_short"):
+                continue
+            ahead += 1
+            if c.get("state") == "ready":
+                c["state"] = "queued"
+                ready_q.put(c)
+
+    def settle(c, body, why):
+        c["body"] = body[:BODY_CAP]
+        c["state"] = ("extract_fail" if why != "ok"
+                      else "too_short" if len(body) < MIN_BODY else "ready")
+        with lock:
+            done[0] += 1
+            print(f"    [{done[0]:2d}/{len(todo)}] {c['domain']:<20} {len(body):>6}자  {c['state']}",
+                  flush=True)
+            release()
+
+    def run():
+        try:
+            fetch = []
+            for c in todo:
+                if c["url"] in cached:
+                    settle(c, cached[c["url"]].get("body", ""), cached[c["url"]].get("why", "ok"))
+                else:
+                    fetch.append(c)
+            if fetch:
+                # 날짜당 카드 20건 남짓 — 추출은 스레드로 충분하다 (이 스레드 안에서 fork하지 않는다)
+                _, stats = article_fetch.fetch_bodies(
+                    [c["url"] for c in fetch], lambda i, body, why: settle(fetch[i], body, why),
+                    cache=fetch_cache.open_default(), procs=0)
+                print(f"    {article_fetch.summary(stats)}", flush=True)
+        finally:
+            with lock:
+                for c in todo:
+                    if c.get("state") == "ready":
+                        c["state"] = "deferred"
+            ready_q.put(None)
+
+    t = threading.Thread(target=run, name="extract", daemon=True)
+    t.start()
+    return ready_q, t
+
+
+def ready_batches(ready_q, size):
+    """큐에서 size건씩 묶어 낸다. 추출이 끝나면 남은 것을 마지막 배치로."""
+    buf = []
+    while True:
+        c = ready_q.get()
+        if c is None:
+            break
+        buf.append(c)
+        if len(buf) == size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+def verify_batch(bi, b, got):
+    """배치 하나의 생성분을 검증한다 (실패하면 한 번 수리). 반환: (통과 [(카드, 해설)], 탈락 [(카드, 사유)])."""
+    passed, dropped = [], []
+    for a in b:
+        if a["state"] == "deferred":
+            continue
+        deep = (got.get(a["i"]) or "").strip()
+        if not deep:
+            dropped.append((a, ["생성 실패"])); continue
+        if DRY_RUN:
+            passed.append((a, deep)); continue
+        ok, reasons = gate(a, deep)
+        if not ok:
+            print(f"      기사 {a['i']} 검증 실패 — 수리 시도: {'; '.join(reasons[:3])}",
+                  flush=True)
+            fixed, why = repair(a, deep, reasons)
+            if why in QUOTA_OUT:
+                a["state"] = "deferred"          # 한도로 못 고쳤다 — 다음 실행에서 새로 만든다
+                continue
+            if fixed:
+                ok2, r2 = gate(a, fixed)
+                if ok2:
+                    deep, ok, reasons = fixed, True, []
+                else:
+                    reasons = [f"수리 후에도: {r}" for r in r2]
+            else:
+                reasons = reasons + [f"수리 실패({why})"]
+        if ok:
+            passed.append((a, deep))
+        else:
+            dropped.append((a, reasons))
+    print(f"    [배치 {bi+1}] 통과 {len(passed)} / 탈락 {len(dropped)}", flush=True)
+    return passed, dropped
+
+
 def run_date(date, path, reuse):
     print(f"\n■ {date} — {path.name}", flush=True)
     cards = collect_cards(path)
@@ -384,12 +513,16 @@ def run_date(date, path, reuse):
         return None
     print(f"  카드 {len(cards)}건", flush=True)
 
+    # 이미 파일이 있는 날짜면 미뤄 둔 카드만 — 검증에 걸려 빠진 카드는 자동으로 다시 돌리지 않는다
+    # (DEEP_DATE로 직접 지정하면 예전처럼 해설이 없는 카드 전부)
+    retry_only = None if ONLY_DATE else pending_urls(date)
     items, todo = {}, []
     for c in cards:
         if c["url"] in reuse:
             items[c["url"]] = dict(reuse[c["url"]])
             continue
-        todo.append(c)
+        if retry_only is None or c["url"] in retry_only:
+            todo.append(c)
     if items:
         print(f"  기존 해설 재사용 {len(items)}건", flush=True)
 
@@ -401,73 +534,70 @@ def run_date(date, path, reuse):
                       json.loads(bp.read_text(encoding="utf-8")).get("articles", [])}
             print(f"  로컬 본문 {len(cached)}건 재사용 ({bp.name})", flush=True)
 
-    print("  본문 추출", flush=True)
-    ready = []
-    for i, c in enumerate(todo):
-        if c["url"] in cached:
-            body, why = cached[c["url"]].get("body", ""), cached[c["url"]].get("why", "ok")
-        else:
-            body, why = extract(c["url"])
-        c["body"] = body[:BODY_CAP]
-        c["state"] = ("extract_fail" if why != "ok"
-                      else "too_short" if len(body) < MIN_BODY else "ready")
-        print(f"    [{i+1:2d}/{len(todo)}] {c['domain']:<20} {len(body):>6}자  {c['state']}",
-              flush=True)
-        if c["state"] == "ready":
-            ready.append(c)
-        if c["url"] not in cached:
-            time.sleep(0.7)
-
-    if not ready:
-        print("  생성 대상 없음", flush=True)
-        return items, [], []
-
-    for i, c in enumerate(ready):
-        c["i"] = i + 1
-        c["tlo"], c["thi"] = target_range(len(c["body"]))
-
-    batches = [ready[i:i + BATCH] for i in range(0, len(ready), BATCH)]
-    print(f"  생성 — {len(ready)}건 / {len(batches)}요청 (배치 {BATCH})", flush=True)
-
-    passed, dropped = [], []
-    for bi, b in enumerate(batches):
-        if DRY_RUN:
-            got = {a["i"]: f"**드라이런.** {a['title_kr'] or a['title_en']}" for a in b}
-        else:
-            t0 = time.time()
-            got, why = generate(b)
-            if bi < len(batches) - 1:
-                time.sleep(max(0, RPM_GAP - (time.time() - t0)))
-        for a in b:
-            deep = (got.get(a["i"]) or "").strip()
-            if not deep:
-                dropped.append((a, ["생성 실패"])); continue
+    want = None
+    if todo and not DRY_RUN:
+        budget = QUOTA.remaining()
+        if budget <= 0:
+            print("  Gemini 한도 소진 — 이 날짜는 다음 실행으로 미룬다 (파일을 만들지 않는다).",
+                  flush=True)
+            return None
+        # 배치 하나가 평균 1 + RETRY_COST회를 쓴다 (응답 누락·잘림 → 1건씩 쪼개기, 검증 실패 → 수리)
+        want = max(1, int((budget - RESERVE) / (1 + RETRY_COST))) * BATCH
+        if want < len(todo):
+            print(f"  남은 한도 {budget}회 (예비 {RESERVE}회 · 배치당 {1 + RETRY_COST:g}회) — "
+                  f"페이지 위쪽부터 최대 {want}건", flush=True)
+
+    print(f"  본문 추출 → 생성 (배치 {BATCH}) → 검증 — "
+          f"{'파이프라인' if PIPELINE else '단계별'}", flush=True)
+    t0, wait0 = time.time(), QUOTA.waited
+    ready_q, extractor = stream_ready(todo, cached, want)
+    if not PIPELINE:
+        extractor.join()
+
+    jobs, n_ready = [], 0
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="verify") as verifier:
+        for bi, b in enumerate(ready_batches(ready_q, BATCH)):
+            for a in b:
+                n_ready += 1
+                a["i"] = n_ready
+                a["tlo"], a["thi"] = target_range(len(a["body"]))
             if DRY_RUN:
-                passed.append((a, deep)); continue
-            ok, reasons = gate(a, deep)
-            if not ok:
-                print(f"      기사 {a['i']} 검증 실패 — 수리 시도: {'; '.join(reasons[:3])}",
-                      flush=True)
-                time.sleep(RPM_GAP)
-                fixed, why = repair(a, deep, reasons)
-                if fixed:
-                    ok2, r2 = gate(a, fixed)
-                    if ok2:
-                        deep, ok, reasons = fixed, True, []
-                    else:
-                        reasons = [f"수리 후에도: {r}" for r in r2]
-                else:
-                    reasons = reasons + [f"수리 실패({why})"]
-            if ok:
-                passed.append((a, deep))
+                got = {a["i"]: f"**드라이런.** {a['title_kr'] or a['title_en']}" for a in b}
+            elif bi and QUOTA.remaining() <= RESERVE:
+                # 계획보다 재시도가 많았다 — 남은 몫은 이미 만든 배치의 수리에 둔다
+                got = {}
+                for a in b:
+                    a["state"] = "deferred"
             else:
-                dropped.append((a, reasons))
-        print(f"    [{bi+1}/{len(batches)}] 통과 {len(passed)} / 탈락 {len(dropped)}",
-              flush=True)
+                got, why = generate(b)
+                if why in QUOTA_OUT:
+                    for a in b:
+                        if not got.get(a["i"]):
+                            a["state"] = "deferred"
+            job = verifier.submit(verify_batch, bi, b, got)
+            if not PIPELINE:
+                job.result()
+            jobs.append(job)
+
+    passed, dropped = [], []
+    for job in jobs:
+        p, d = job.result()
+        passed += p
+        dropped += d
+    deferred = [c for c in todo if c.get("state") == "deferred"]
+    if deferred:
+        print(f"  한도로 미룬 {len(deferred)}건 — pending으로 남겨 다음 실행에서 이어 만든다", flush=True)
+        dropped += [(c, ["한도 — 다음 실행으로 미룸"]) for c in deferred]
+    pending = [c["url"] for c in deferred]
+    if not n_ready:
+        print("  생성 대상 없음", flush=True)
+        return items, [], dropped, pending
+    print(f"  생성 {n_ready}건 / {len(jobs)}배치 — 벽시계 {time.time() - t0:.0f}초 "
+          f"(호출 간격 대기 {QUOTA.waited - wait0:.0f}초)", flush=True)
 
     for a, deep in passed:
         items[a["url"]] = {"deep": deep, "by": MODEL, "n": len(deep)}
-    return items, passed, dropped
+    return items, passed, dropped, pending
 
 
 def main():
@@ -478,6 +608,11 @@ def main():
     if not targets:
         print("새로 해설을 만들 날짜가 없습니다.")
         return
+    if not DRY_RUN and QUOTA.remaining() <= 0:
+        # 나올 게 뻔한 429를 기다리지 않는다 — 원문도 받지 않고 끝낸다
+        print(f"Gemini 한도가 남지 않았습니다. {QUOTA.summary()} · "
+              f"리셋까지 {gemini_quota.reset_in() / 3600:.1f}시간", flush=True)
+        return
     reuse = existing_deep_by_url()
     print(f"기존 해설 {len(reuse)}건 보유 · 대상 {[d for d, _ in targets]}", flush=True)
 
@@ -487,7 +622,7 @@ def main():
         res = run_date(date, path, reuse)
         if not res:
             continue
-        items, passed, dropped = res
+        items, passed, dropped, pending = res
         if not items:
             print(f"  {date} — 저장할 항목이 없어 파일을 만들지 않는다.", flush=True)
             continue
@@ -496,19 +631,22 @@ def main():
                   flush=True)
             continue
         out = {"date": date, "v": 1, "items": items}
+        if pending:
+            out["pending"] = pending             # target_dates가 이 날짜를 다시 고른다
         (DEEP_DIR / f"{date}.json").write_text(
             json.dumps(out, ensure_ascii=False, indent=1), encoding="utf-8")
         wrote += 1
         tb = sum(len(a["body"]) for a, _ in passed) or 1
         td = sum(len(d) for _, d in passed)
         print(f"  ✅ deep/{date}.json — {len(items)}건 저장 "
-              f"(신규 {len(passed)} · 탈락 {len(dropped)})", flush=True)
+              f"(신규 {len(passed)} · 탈락 {len(dropped) - len(pending)} · 미룸 {len(pending)})", flush=True)
         report.append(f"## {date}\n")
-        report.append(f"- 저장 **{len(items)}건** (신규 {len(passed)} · 탈락 {len(dropped)})")
+        report.append(f"- 저장 **{len(items)}건** (신규 {len(passed)} · 탈락 {len(dropped) - len(pending)}"
+                      f" · 미룸 {len(pending)})")
         if passed:
             report.append(f"- 신규분 원문 {tb:,}자 → 해설 {td:,}자 = {td/tb*100:.1f}%")
         if dropped:
-            report.append("\n### 탈락 (검증 미통과 — 저장하지 않음)\n")
+            report.append("\n### 탈락·미룸 (저장하지 않음)\n")
             report.append("| 기사 | 사유 |")
             report.append("|---|---|")
             for a, rs in dropped:
@@ -516,10 +654,10 @@ def main():
                               f"{'; '.join(rs[:4])} |")
         report.append("")
 
-    report.append(f"\nGemini 호출 {_requests_used}회 (상한 {MAX_REQUESTS})")
+    report.append(f"\nGemini 호출 {QUOTA.run_used}회 (실행 상한 {MAX_REQUESTS})  \n{QUOTA.summary()}")
     (ROOT / "out").mkdir(exist_ok=True)
     (ROOT / "out" / "deep-generate.md").write_text("\n".join(report) + "\n", encoding="utf-8")
-    print(f"\n■ 완료 — 파일 {wrote}개 · Gemini 호출 {_requests_used}회", flush=True)
+    print(f"\n■ 완료 — 파일 {wrote}개 · Gemini 호출 {QUOTA.run_used}회\n{QUOTA.summary()}", flush=True)
 
 
 if __name__ == "__main__":
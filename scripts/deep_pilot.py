@@ -16,11 +16,13 @@
 """
 import os, re, sys, json, time, html, random
 from collections import Counter, defaultdict
-from urllib.parse import urlparse
 from pathlib import Path
 
 import requests
-from bs4 import BeautifulSoup
+
+import article_fetch                 # 원문 받기·본문 추출 (deep_extract와 공용)
+import card_manifest
+import fetch_cache
 
 # ── 설정 ───────────────────────────────────────────────────────────
 N_ARTICLES = int(os.environ.get("PILOT_COUNT", "30"))
@@ -34,14 +36,6 @@ MODELS = [
     ("gemini-3.5-flash-lite", "3.5 Flash-Lite", 15),
 ]
 
-UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-      "(KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36")
-HEADERS = {
-    "User-Agent": UA,
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Language": "en-US,en;q=0.9",
-}
-
 ROOT = Path(__file__).resolve().parent.parent
 OUT  = ROOT / "out"
 OUT.mkdir(exist_ok=True)
@@ -69,67 +63,26 @@ def collect_cards(n, daily_only=True):
     for f in files:
         if len(picked) >= n:
             break
-        soup = BeautifulSoup(f.read_text(encoding="utf-8"), "html.parser")
-        for c in soup.select(".jfnb-card"):
+        # post_process가 구워 둔 data/cards.json (낡았으면 HTML 파싱 폴백)
+        for c in card_manifest.cards_for(f):
             if len(picked) >= n:
                 break
-            url = c.get("data-card-url", "")
+            url = c["url"]
             if not url or url in seen:
                 continue
             seen.add(url)
-            kr = c.select_one(".article-title-kr, .title-kr")
-            summ = c.select_one(".article-summary")
             picked.append({
                 "file":    f.name,
-                "id":      c.get("id", ""),
+                "id":      c["id"],
                 "url":     url,
-                "domain":  urlparse(url).netloc.replace("www.", ""),
-                "title_en": c.get("data-card-title", "")[:200],
-                "title_kr": _txt(kr),
-                "summary_now": _txt(summ),
+                "domain":  article_fetch.domain_of(url),
+                "title_en": c["title_en"][:200],
+                "title_kr": c["title_kr"],
+                "summary_now": c["summary_now"],
             })
     return picked
 
 
-def _txt(el):
-    return re.sub(r"\s+", " ", el.get_text(" ", strip=True)).strip() if el else ""
-
-
-# ── 2. 본문 추출 ───────────────────────────────────────────────────
-def extract(url):
-    """반환: (본문 str, 상태 str). 상태는 리포트용 사유 문자열."""
-    try:
-        r = requests.get(url, headers=HEADERS, timeout=25, allow_redirects=True)
-    except Exception as e:
-        return "", f"net:{type(e).__name__}"
-    if r.status_code != 200:
-        return "", f"http:{r.status_code}"
-
-    body = ""
-    try:
-        import trafilatura
-        body = trafilatura.extract(
-            r.text, include_comments=False, include_tables=False,
-            favor_precision=True, url=url
-        ) or ""
-    except Exception:
-        pass
-
-    if len(body) < 400:                      # 폴백 — 문단 태그 직접 수집
-        soup = BeautifulSoup(r.text, "html.parser")
-        for bad in soup.select("script,style,nav,footer,header,aside,form"):
-            bad.decompose()
-        ps = [_txt(p) for p in soup.find_all("p")]
-        alt = "\n".join(p for p in ps if len(p) > 60)
-        if len(alt) > len(body):
-            body = alt
-
-    body = re.sub(r"\n{3,}", "\n\n", body).strip()
-    if not body:
-        return "", "empty"
-    return body, "ok"
-
-
 # ── 3. 프롬프트 ────────────────────────────────────────────────────
 SYSTEM = """너는 한국 경제·기술 매체의 외신 데스크다. 영문 기사 원문을 받아
 한국 독자를 위한 '상세 해설'을 쓴다.
@@ -235,10 +188,10 @@ def main():
     cards = collect_cards(N_ARTICLES)
     print(f"  {len(cards)}건 (파일 {len(set(c['file'] for c in cards))}개)\n", flush=True)
 
-    print("■ 본문 추출", flush=True)
+    print("■ 본문 추출 (.cache/fetch 캐시 사용)", flush=True)
     stat = defaultdict(lambda: {"try": 0, "ok": 0, "short": 0, "fail": 0, "lens": [], "why": Counter()})
-    for i, c in enumerate(cards):
-        body, why = extract(c["url"])
+    got, stats = article_fetch.fetch_bodies([c["url"] for c in cards], cache=fetch_cache.open_default())
+    for i, (c, (body, why)) in enumerate(zip(cards, got)):
         c["body"], c["extract"] = body, why
         s = stat[c["domain"]]
         s["try"] += 1
@@ -252,7 +205,7 @@ def main():
             s["ok"] += 1; s["lens"].append(len(body))
             c["state"] = "ready"
         print(f"  [{i+1:2d}/{len(cards)}] {c['domain']:<20} {len(body):>6}자  {c['state']}", flush=True)
-        time.sleep(0.7)
+    print(f"  {article_fetch.summary(stats)}", flush=True)
 
     ready = [c for c in cards if c["state"] == "ready"]
     print(f"\n  생성 대상 {len(ready)}건 / 전체 {len(cards)}건\n", flush=True)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+원문 fetch 캐시 (.cache/fetch/) — deep_extract · deep_generate · deep_pilot이 같이 쓴다
+
+같은 원문 URL을 세 스크립트가 따로 받고 있었다. deep_extract가 받은 것을 deep_generate가
+(DEEP_BODIES_DIR 아티팩트를 따로 지정하지 않는 한) 다시 받고, Gemini 단계에서 실패해
+다시 돌리면 또 받는다. 여기에 한 번 받은 것을 남겨 둔다.
+
+  .cache/fetch/index.json              : {정규화 URL: 항목}
+  .cache/fetch/html/<sha256>.gz        : 원문 HTML (gzip) — 내용 주소, 같은 HTML은 한 벌
+  .cache/fetch/body/<sha256>.<추출기>.gz : 그 HTML에서 뽑은 본문 — 추출 코드가 바뀌면 새로 뽑는다
+  항목: {"sha": HTML 해시 | null, "why": "ok"·"http:403"·"net:…", "etag", "lm": Last-Modified,
+         "fetched": 받은(확인한) 시각, "used": 마지막으로 쓴 시각}
+
+· TTL(FETCH_CACHE_TTL_H, 기본 72시간) 안이면 네트워크에 가지 않는다. 실패(403·타임아웃)도
+  FAIL_TTL 동안은 기억한다 — 재실행이 막힌 매체를 다시 두드리지 않는다.
+· TTL이 지났고 ETag/Last-Modified가 있으면 조건부 요청 — 304면 저장본을 그대로 쓴다.
+  200이 와도 내용 해시가 같으면 본문을 다시 뽑지 않는다.
+· 상태(ready/too_short/extract_fail)는 저장하지 않는다. extract_fail은 why로,
+  나머지 둘은 본문 길이로 정해지는데 길이 기준이 스크립트마다 다르다(EXTRACT_/DEEP_/PILOT_MIN_BODY).
+· save() 때 MAX_AGE_DAYS 동안 안 쓴 항목을 버리고, 합계가 FETCH_CACHE_MAX_MB를 넘으면
+  오래 안 쓴 순으로 버린 뒤 아무 항목도 가리키지 않는 파일을 지운다.
+
+Actions에서는 세 워크플로가 actions/cache로 이 디렉터리를 이어 받는다.
+저장소에는 아무것도 쓰지 않는다 (.gitignore).
+"""
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CACHE_DIR    = Path(os.environ.get("FETCH_CACHE_DIR", "") or ROOT / ".cache" / "fetch")
+TTL_H        = float(os.environ.get("FETCH_CACHE_TTL_H", "72"))
+FAIL_TTL_H   = 12
+MAX_AGE_DAYS = 30
+MAX_MB       = float(os.environ.get("FETCH_CACHE_MAX_MB", "300"))
+
+# 같은 기사인데 붙어 오는 추적 파라미터
+_TRACKING = ("utm_", "fbclid", "gclid", "guccounter", "guce_", "cmpid", "mc_cid", "mc_eid", "ocid")
+
+
+def canonical_url(url):
+    """캐시 키. 스킴·호스트 소문자, www. 제거, 조각(#) 제거, 추적 파라미터 제거 후 정렬."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.lower().startswith(_TRACKING))
+    return urlunsplit((parts.scheme.lower(), host, parts.path or "/", urlencode(query), ""))
+
+
+def _sha(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class FetchCache:
+    def __init__(self, path=CACHE_DIR, ttl_h=TTL_H, fail_ttl_h=FAIL_TTL_H,
+                 max_mb=MAX_MB, max_age_days=MAX_AGE_DAYS):
+        self.path = Path(path)
+        self.ttl = ttl_h * 3600
+        self.fail_ttl = fail_ttl_h * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age = max_age_days * 86400
+        try:
+            self.entries = json.loads((self.path / "index.json").read_text("utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+        self.extractors = set()            # 이번 실행에서 쓴 추출기 — 나머지 본문 파일은 정리 대상
+
+    # ── 조회 ──────────────────────────────────────────────────────
+    def lookup(self, url):
+        return self.entries.get(canonical_url(url))
+
+    def is_fresh(self, entry):
+        ttl = self.ttl if entry["why"] == "ok" else self.fail_ttl
+        return time.time() - entry["fetched"] < ttl and (entry["why"] != "ok" or self._has_html(entry))
+
+    def validators(self, entry):
+        """조건부 요청 헤더. 저장된 HTML이 없으면 304를 받아도 쓸 게 없으니 보내지 않는다."""
+        if not entry or entry["why"] != "ok" or not self._has_html(entry):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("lm"):
+            headers["If-Modified-Since"] = entry["lm"]
+        return headers
+
+    def load_html(self, entry):
+        try:
+            return gzip.decompress(self._html_path(entry["sha"]).read_bytes()).decode("utf-8")
+        except (OSError, TypeError, ValueError):
+            return None
+
+    def load_body(self, entry, extractor):
+        self.extractors.add(extractor)
+        try:
+            return gzip.decompress(self._body_path(entry["sha"], extractor).read_bytes()).decode("utf-8")
+        except (OSError, TypeError, ValueError):
+            return None
+
+    # ── 기록 ──────────────────────────────────────────────────────
+    def store(self, url, html, why, meta):
+        """받은 결과를 적고 항목을 돌려준다. 실패면 HTML 없이 사유만."""
+        now = time.time()
+        sha = None
+        if why == "ok":
+            sha = _sha(html)
+            p = self._html_path(sha)
+            if not p.exists():
+                self._write(p, html)
+        entry = {"sha": sha, "why": why, "etag": meta.get("etag"), "lm": meta.get("last_modified"),
+                 "fetched": now, "used": now}
+        self.entries[canonical_url(url)] = entry
+        return entry
+
+    def revalidated(self, entry, meta):
+        """304 — 저장본이 여전히 최신이다."""
+        entry["fetched"] = entry["used"] = time.time()
+        entry["etag"] = meta.get("etag") or entry.get("etag")
+        entry["lm"] = meta.get("last_modified") or entry.get("lm")
+
+    def store_body(self, entry, extractor, body):
+        self.extractors.add(extractor)
+        self._write(self._body_path(entry["sha"], extractor), body)
+
+    def touch(self, entry):
+        entry["used"] = time.time()
+
+    def save(self):
+        """오래된 항목·용량 초과분을 버리고 index.json을 쓴다. 반환: 정리 요약 문자열."""
+        now = time.time()
+        dropped = [k for k, e in self.entries.items() if now - e["used"] > self.max_age]
+        for k in dropped:
+            del self.entries[k]
+
+        sizes = {}
+        for e in self.entries.values():
+            if e["sha"] and e["sha"] not in sizes:
+                sizes[e["sha"]] = self._blob_bytes(e["sha"])
+        total = sum(sizes.values())
+        if total > self.max_bytes:
+            # 같은 HTML을 가리키는 항목이 여럿이면 마지막 항목이 빠질 때 용량이 준다
+            refs = {}
+            for e in self.entries.values():
+                if e["sha"]:
+                    refs[e["sha"]] = refs.get(e["sha"], 0) + 1
+            for k, e in sorted(self.entries.items(), key=lambda kv: kv[1]["used"]):
+                if total <= self.max_bytes:
+                    break
+                del self.entries[k]
+                dropped.append(k)
+                if e["sha"]:
+                    refs[e["sha"]] -= 1
+                    if not refs[e["sha"]]:
+                        total -= sizes[e["sha"]]
+
+        removed = self._collect_garbage()
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / "index.json.tmp"
+        tmp.write_text(json.dumps(self.entries, ensure_ascii=False, separators=(",", ":"), sort_keys=True),
+                       "utf-8")
+        tmp.replace(self.path / "index.json")
+        return (f"항목 {len(self.entries)}개 · {total / 1024 / 1024:.1f}MB"
+                f" (버린 항목 {len(dropped)} · 지운 파일 {removed})")
+
+    # ── 내부 ──────────────────────────────────────────────────────
+    def _html_path(self, sha):
+        return self.path / "html" / f"{sha}.gz"
+
+    def _body_path(self, sha, extractor):
+        return self.path / "body" / f"{sha}.{extractor}.gz"
+
+    def _has_html(self, entry):
+        return bool(entry["sha"]) and self._html_path(entry["sha"]).exists()
+
+    def _blob_bytes(self, sha):
+        total = 0
+        for p in [self._html_path(sha), *(self.path / "body").glob(f"{sha}.*.gz")]:
+            try:
+                total += p.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _write(self, path, text):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(gzip.compress(text.encode("utf-8"), mtime=0))
+        tmp.replace(path)
+
+    def _collect_garbage(self):
+        """어느 항목도 가리키지 않는 HTML, 이번 추출기가 아닌 본문 파일을 지운다."""
+        live = {e["sha"] for e in self.entries.values() if e["sha"]}
+        removed = 0
+        for p in (self.path / "html").glob("*.gz"):
+            if p.name[:-3] not in live:
+                p.unlink(missing_ok=True)
+                removed += 1
+        for p in (self.path / "body").glob("*.gz"):
+            sha, extractor = p.name[:-3].split(".", 1)
+            if sha not in live or (self.extractors and extractor not in self.extractors):
+                p.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+def open_default():
+    """환경 변수 설정대로 연 캐시. FETCH_CACHE=0이면 None — 캐시 없이 매번 받는다."""
+    if os.environ.get("FETCH_CACHE", "") == "0":
+        return None
+    return FetchCache()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gemini 호출 한도 장부 (.cache/gemini/quota.json) — 실행이 바뀌어도 이어지는 RPD·RPM 관리
+
+DEEP_MAX_REQUESTS와 RPM 간격은 프로세스 안에서만 셌다. 같은 날 두 번째 실행
+(workflow_run 뒤의 수동 workflow_dispatch, 재시도)은 무료 등급 20 RPD가 이미 얼마나
+나갔는지 모른 채 시작해, 나올 게 뻔한 429를 call_gemini가 20·40·60초씩 자며 받아 냈다.
+
+  장부: {"v": 1, "days": {태평양 날짜: {모델: {"requests": 보낸 요청 수, "exhausted": 일 한도 429를 받았나,
+                                             "tokens_in", "tokens_out",
+                                             "calls": [[시각, 결과, 입력 토큰, 출력 토큰], …]}}}}
+
+· 무료 등급 일 한도는 태평양 시각 자정에 찬다. 날짜 키도 태평양 날짜다.
+· 요청은 보내기 전에 적고 바로 저장한다. 도중에 죽은 실행이 쓴 요청도 다음 실행이 안다.
+· 일 한도(RPD) 429를 받으면 그날은 소진으로 적는다. 장부가 없어졌어도 429 한 번이면 멈춘다.
+· RPM은 토큰 버킷 — 용량 burst, RPM_GAP초마다 1개씩 찬다. 시작할 때 최근 호출 시각을
+  다시 흘려 채워 두므로 직전 실행에 바로 이어 돌아도 분당 한도를 넘지 않는다.
+  분당 한도 429면 서버가 알려 준 retryDelay만큼 버킷을 비운다.
+· 한 실행의 상한(DEEP_MAX_REQUESTS)도 여기서 같이 센다. remaining()은 둘 중 작은 쪽.
+
+Actions에서는 deep-generate 워크플로가 actions/cache로 이 디렉터리를 이어 받는다 (.gitignore).
+"""
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+LEDGER_PATH = Path(os.environ.get("GEMINI_QUOTA_FILE", "") or ROOT / ".cache" / "gemini" / "quota.json")
+RPD         = int(os.environ.get("GEMINI_RPD", "20"))          # 무료 등급 Flash 일 한도
+BURST       = int(os.environ.get("GEMINI_RPM_BURST", "1"))     # 버킷 용량 — 1이면 간격 그대로
+KEEP_DAYS   = 7
+
+try:
+    from zoneinfo import ZoneInfo
+    PACIFIC = ZoneInfo("America/Los_Angeles")
+except Exception:                          # tzdata가 없는 환경 — 서머타임은 무시한다
+    PACIFIC = timezone(timedelta(hours=-8))
+
+
+def quota_day(ts=None):
+    """한도가 도는 날짜 (태평양 시각)."""
+    return datetime.fromtimestamp(ts if ts is not None else time.time(), PACIFIC).strftime("%Y-%m-%d")
+
+
+def reset_in(ts=None):
+    """다음 일 한도 리셋(태평양 자정)까지 남은 초."""
+    now = datetime.fromtimestamp(ts if ts is not None else time.time(), PACIFIC)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - now).total_seconds()
+
+
+def classify_429(text):
+    """429 본문 → ("day" | "minute", 서버가 알려 준 대기 초 or None)."""
+    try:
+        details = json.loads(text).get("error", {}).get("details", [])
+    except (ValueError, AttributeError):
+        details = []
+    scope, delay = "minute", None
+    for d in details:
+        for v in d.get("violations", []) or []:
+            if "PerDay" in (v.get("quotaId") or ""):
+                scope = "day"
+        m = re.match(r"([\d.]+)s$", d.get("retryDelay") or "")
+        if m:
+            delay = float(m.group(1))
+    return scope, delay
+
+
+class QuotaLedger:
+    def __init__(self, model, gap, run_cap, rpd=RPD, burst=BURST, path=LEDGER_PATH):
+        self.model = model
+        self.rate = 1 / gap if gap > 0 else float("inf")
+        self.burst = max(1, burst)
+        self.run_cap = run_cap
+        self.rpd = rpd
+        self.path = Path(path)
+        self.run_used = 0                  # 이번 실행이 보낸 요청
+        self.waited = 0.0                  # RPM 때문에 기다린 초 합
+        self._lock = threading.Lock()
+        try:
+            self.data = json.loads(self.path.read_text("utf-8"))
+        except (OSError, ValueError):
+            self.data = {"v": 1, "days": {}}
+        self._tokens, self._at = self._replay()
+
+    # ── 조회 ──────────────────────────────────────────────────────
+    def today(self):
+        return (self.data["days"].setdefault(quota_day(), {})
+                .setdefault(self.model, {"requests": 0, "exhausted": False,
+                                         "tokens_in": 0, "tokens_out": 0, "calls": []}))
+
+    def remaining(self):
+        """지금 더 보낼 수 있는 요청 수 — 오늘 남은 일 한도와 이번 실행 상한 중 작은 쪽."""
+        with self._lock:
+            t = self.today()
+            day_left = 0 if t["exhausted"] else max(0, self.rpd - t["requests"])
+            return min(day_left, max(0, self.run_cap - self.run_used))
+
+    def summary(self):
+        t = self.today()
+        state = "소진" if t["exhausted"] else f"{t['requests']}/{self.rpd}"
+        return (f"[Gemini 한도] {quota_day()} (태평양) {self.model} {state} · 이번 실행 {self.run_used}회"
+                f" · 토큰 입력 {t['tokens_in']:,} / 출력 {t['tokens_out']:,} · RPM 대기 {self.waited:.0f}초")
+
+    # ── 호출 ──────────────────────────────────────────────────────
+    def acquire(self):
+        """
+        요청 하나의 자리를 잡는다. 한도가 남았으면 장부에 적고, 버킷에 토큰이 찰 때까지
+        기다린 뒤 호출 기록(list)을 돌려준다 — 끝나면 record()에 넘긴다. 남은 한도가 없으면 None.
+        자리는 잠금 안에서 차례로 나눠 주고 기다리기는 잠금 밖에서 한다.
+        """
+        with self._lock:
+            t = self.today()
+            if t["exhausted"] or t["requests"] >= self.rpd or self.run_used >= self.run_cap:
+                return None
+            now = time.time()
+            self._refill(now)
+            self._tokens -= 1              # 음수면 앞 예약분 — 그만큼 더 기다린다
+            wait = max(0.0, -self._tokens / self.rate)
+            t["requests"] += 1
+            self.run_used += 1
+            call = [round(now + wait, 3), "sent", 0, 0]
+            t["calls"].append(call)
+            self.waited += wait
+            self._save()
+        if wait > 0:
+            time.sleep(wait)
+        return call
+
+    def record(self, call, status, usage=None):
+        """호출 결과. usage는 Gemini 응답의 usageMetadata."""
+        with self._lock:
+            call[1] = status
+            if usage:
+                t = self.today()
+                call[2] = usage.get("promptTokenCount", 0)
+                call[3] = usage.get("candidatesTokenCount", 0) + usage.get("thoughtsTokenCount", 0)
+                t["tokens_in"] += call[2]
+                t["tokens_out"] += call[3]
+            self._save()
+
+    def exhaust(self):
+        """일 한도 429 — 오늘은 더 보내지 않는다."""
+        with self._lock:
+            self.today()["exhausted"] = True
+            self._save()
+
+    def penalize(self, secs):
+        """분당 한도 429 — secs 동안 버킷을 비워 둔다."""
+        with self._lock:
+            self._refill(time.time())
+            self._tokens = min(self._tokens, -secs * self.rate)
+
+    # ── 내부 ──────────────────────────────────────────────────────
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._at) * self.rate)
+        self._at = now
+
+    def _replay(self):
+        """장부의 최근 호출 시각을 버킷에 다시 흘려 지금 상태를 만든다."""
+        now = time.time()
+        since = now - self.burst / self.rate - 60 if self.rate != float("inf") else now
+        recent = sorted(c[0] for day in self.data["days"].values()
+                        for c in day.get(self.model, {}).get("calls", []) if c[0] > since)
+        tokens, at = float(self.burst), since
+        for ts in recent:
+            tokens = min(self.burst, tokens + (ts - at) * self.rate) - 1
+            at = ts
+        return tokens, at
+
+    def _save(self):
+        keep = sorted(self.data["days"])[-KEEP_DAYS:]
+        self.data["days"] = {d: self.data["days"][d] for d in keep}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(self.data, ensure_ascii=False, separators=(",", ":"), sort_keys=True),
+                       "utf-8")
+        tmp.replace(self.path)
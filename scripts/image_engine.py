@@ -0,0 +1,249 @@
+"""
+이미지 선발 배치 엔진 (NumPy · 선택 의존성) — post_process.py --engine numpy
+
+파이썬 경로(resolve_image_from_pool)는 요청이 올 때마다 후보 풀을 하나씩 점수 매긴다.
+이 엔진은 실행 전체의 선발 요청(collect_image_requests)을 먼저 받아
+  · 카탈로그 → 태그 발생 행렬 M (이미지 × 태그) + 이미지 노이즈 벡터
+  · 요청 텍스트 → 태그 적중 행렬 H (요청 × 태그)
+  · 기본 점수 S = H·Mᵀ + (기사 노이즈 + 이미지 노이즈) / 2   (요청 × 이미지, 한 번에)
+를 계산한 뒤, 영구·윈도우·실행 dedup 페널티를 마스크로 얹어 요청 순서대로 고른다.
+페널티 값은 파이썬 경로와 같은 image_penalties의 상수를 쓴다.
+
+greedy 모드는 파이썬 경로와 선택이 같다 — 부동소수 연산 순서까지 맞췄다
+(태그 점수 + 노이즈 → -영구 페널티 → -50 → -10000, 동점은 후보 순서상 앞쪽).
+검증: --engine numpy 전체 빌드의 archive/·briefings.json이 python 엔진과 바이트 단위로 같다.
+
+assign 모드 (--engine assign)
+  greedy는 먼저 처리된 기사가 좋은 사진을 가져가고 뒤 기사는 페널티 찌꺼기를 받는다.
+  assign은 날짜순으로 하루치 요청 × 사진 비용 행렬에 최소 비용 배정(사진당 한 번)을 푼다.
+  행은 (날짜, 제목, 본문) 순으로 정렬해서 풀기 때문에 목록 순서·처리 순서와 무관하게 같은
+  결과가 나온다. 이 실행에서 그 날짜 전 window_days일 안에 쓴 사진은 -RUN (구르는 창 —
+  예전 달력 구간은 경계 양쪽 날짜끼리 겹쳐도 -100뿐이었다), 영구 dedup(원장의 사용 이력,
+  이번 실행이 다시 고르는 날짜 제외)은 사진별 페널티 (-PERSISTENT 또는 이력 건수 × -HISTORY).
+  자기 풀 밖(전역 후보)은 -FALLBACK을 얹어 풀이 모자랄 때만 쓰이게 한다.
+  사진(97장)보다 요청이 많은 날은 재사용 열(-RUN)을 붙여 최소한만 겹치게 한다.
+  비용 상한: 날짜당 O(n²·m) (n = 그날 요청 수 · m = 사진 수 97).
+  scipy 결과와 동점 처리가 달라질 수 있어 풀이기는 여기 구현(최단 증가 경로)만 쓴다.
+"""
+import re
+from collections import deque
+from datetime import date
+
+import numpy as np
+
+from image_penalties import DEDUP_DAYS, PENALTY_PERSISTENT, PENALTY_RUN, PENALTY_WINDOW
+
+PENALTY_FALLBACK   = 1000.0     # assign: 자기 풀 밖 전역 후보
+_FORBIDDEN         = 1e9
+_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+
+
+class ImageMatrix:
+    """핸드픽 카탈로그의 행렬 표현. 같은 photo id라도 풀마다 alt·태그가 다른 항목은 따로 둔다."""
+
+    def __init__(self, pools, global_candidates, img_noise):
+        self.entries = []                       # 이미지 dict (객체 단위로 중복 제거)
+        row_of = {}
+        for pool in list(pools) + [global_candidates]:
+            for img in pool:
+                if id(img) not in row_of:
+                    row_of[id(img)] = len(self.entries)
+                    self.entries.append(img)
+
+        self.photo_ids = list(dict.fromkeys(img["id"] for img in self.entries))
+        self.photo_index = {pid: i for i, pid in enumerate(self.photo_ids)}
+        self.photo = np.array([self.photo_index[img["id"]] for img in self.entries], dtype=np.int64)
+
+        self.tags = list(dict.fromkeys(t for img in self.entries for t in img.get("tags", []) if t))
+        tag_col = {t: j for j, t in enumerate(self.tags)}
+        self.incidence = np.zeros((len(self.entries), len(self.tags)))
+        for i, img in enumerate(self.entries):
+            for t in img.get("tags", []):
+                if t:
+                    self.incidence[i, tag_col[t]] += 1.0
+
+        self.noise = np.array([img_noise(img["id"]) for img in self.entries])
+        self.pool_rows = {id(pool): np.array([row_of[id(img)] for img in pool], dtype=np.int64)
+                          for pool in pools}
+        self.global_rows = np.array([row_of[id(img)] for img in global_candidates], dtype=np.int64)
+
+    def tag_hits(self, texts) -> np.ndarray:
+        """요청 × 태그 적중 행렬. 태그 매칭은 파이썬 경로와 같은 소문자 부분문자열 포함."""
+        hits = np.zeros((len(texts), len(self.tags)))
+        for r, text in enumerate(texts):
+            low = text.lower()
+            hits[r] = [t in low for t in self.tags]
+        return hits
+
+    def base_scores(self, texts, base_noise) -> np.ndarray:
+        """요청 × 이미지 점수 (페널티 전). 태그 점수는 정수라 행렬곱에서 오차가 생기지 않는다."""
+        tag_score = self.tag_hits(texts) @ self.incidence.T
+        return tag_score + (np.asarray(base_noise)[:, None] + self.noise[None, :]) / 2.0
+
+    def photo_mask(self, photo_ids) -> np.ndarray:
+        mask = np.zeros(len(self.photo_ids), dtype=bool)
+        for pid in photo_ids:
+            i = self.photo_index.get(pid)
+            if i is not None:
+                mask[i] = True
+        return mask
+
+    def photo_penalty(self, penalties) -> np.ndarray:
+        """{photo id: 페널티} → 사진별 벡터 (없는 사진은 0.0 — 빼도 점수가 그대로다)."""
+        vec = np.zeros(len(self.photo_ids))
+        for pid, value in penalties.items():
+            i = self.photo_index.get(pid)
+            if i is not None:
+                vec[i] = value
+        return vec
+
+
+def greedy_picks(matrix: ImageMatrix, requests, hash_noise,
+                 persistent=None, window=(), run=(), window_size=15) -> list:
+    """
+    requests: [(pool, title, date_str, article_text), ...] — 직렬 단계의 호출 순서 그대로.
+    persistent: 시작 시점의 영구 페널티 {photo id: 값}. window/run: 시작 시점의 dedup 상태 (photo id).
+    반환: 요청별 선택 이미지 dict.
+    """
+    if not requests:
+        return []
+    scores = matrix.base_scores([r[3] for r in requests],
+                                [hash_noise(r[1], r[2]) for r in requests])
+
+    persist = matrix.photo_penalty(persistent or {})
+    used    = matrix.photo_mask(run)
+    in_win  = np.zeros(len(matrix.photo_ids), dtype=np.int64)
+    win     = deque(maxlen=window_size)
+    for pid in window:
+        i = matrix.photo_index.get(pid, -1)
+        if len(win) == win.maxlen and win[0] >= 0:
+            in_win[win[0]] -= 1
+        win.append(i)
+        if i >= 0:
+            in_win[i] += 1
+
+    picks = []
+    for r, (pool, *_rest) in enumerate(requests):
+        rows = matrix.pool_rows[id(pool)]
+        if len(rows) and used[matrix.photo[rows]].all():
+            # 풀 소진 — 실행에서 아직 안 쓴 전역 후보를 뒤에 붙인다
+            spare = matrix.global_rows[~used[matrix.photo[matrix.global_rows]]]
+            rows = np.concatenate([rows, spare])
+
+        ph = matrix.photo[rows]
+        s = scores[r, rows]
+        s = s - persist[ph]
+        s = np.where(in_win[ph] > 0, s - PENALTY_WINDOW, s)
+        s = np.where(used[ph], s - PENALTY_RUN, s)
+        row = rows[int(np.argmax(s))]
+        picks.append(matrix.entries[row])
+
+        i = matrix.photo[row]
+        persist[i] = PENALTY_PERSISTENT
+        used[i] = True
+        if len(win) == win.maxlen and win[0] >= 0:
+            in_win[win[0]] -= 1
+        win.append(i)
+        in_win[i] += 1
+    return picks
+
+
+# ── assign 모드: 구간별 최소 비용 배정 ─────────────────────────────
+def _min_cost_assignment(cost: np.ndarray) -> np.ndarray:
+    """
+    n ≤ m 비용 행렬의 최소 비용 배정 (포텐셜 + 최단 증가 경로, O(n²·m)).
+    반환: 행별 열 번호. 열 방향 연산은 벡터로 돈다.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64)     # 열 j를 가진 행 (1부터, 0 = 비어 있음)
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            cand = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(cand)) + 1
+            delta = cand[j1 - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+    cols = np.empty(n, dtype=np.int64)
+    assigned = np.nonzero(owner[1:])[0]
+    cols[owner[1:][assigned] - 1] = assigned
+    return cols
+
+
+def _day(date_str: str):
+    """날짜 서수. 날짜가 없는 항목(스페셜 등)은 None — 한 묶음으로 먼저 풀고 창에는 넣지 않는다."""
+    m = _DATE_RE.search(date_str)
+    return date(int(m[1]), int(m[2]), int(m[3])).toordinal() if m else None
+
+
+def assign_picks(matrix: ImageMatrix, requests, hash_noise,
+                 persistent=None, window_days=DEDUP_DAYS) -> list:
+    """
+    requests: greedy_picks와 같은 형식. persistent: 영구 페널티 {photo id: 값} (post_process가
+    이번 실행이 다시 고르는 날짜의 기록을 빼고 읽는다 — 같은 입력이면 같은 결과).
+    반환: 요청별 선택 이미지 dict.
+    """
+    if not requests:
+        return []
+    scores = matrix.base_scores([r[3] for r in requests],
+                                [hash_noise(r[1], r[2]) for r in requests])
+    n_photo = len(matrix.photo_ids)
+    persist = matrix.photo_penalty(persistent or {})
+
+    days = {}
+    for r, (_, title, date_str, text) in enumerate(requests):
+        days.setdefault(_day(date_str), []).append(r)
+
+    picks = [None] * len(requests)
+    last_used = np.full(n_photo, np.iinfo(np.int64).min // 2)   # 이 실행에서 사진을 마지막으로 쓴 날
+    for day in sorted(days, key=lambda d: (d is not None, d or 0)):
+        rows = sorted(days[day], key=lambda r: (requests[r][2], requests[r][1], requests[r][3]))
+        recent = (day - last_used <= window_days) if day is not None else np.zeros(n_photo, dtype=bool)
+        cost = np.full((len(rows), n_photo), _FORBIDDEN)
+        choice = np.zeros((len(rows), n_photo), dtype=np.int64)
+        for k, r in enumerate(rows):
+            own = matrix.pool_rows[id(requests[r][0])]
+            extra = matrix.global_rows[~np.isin(matrix.global_rows, own)]
+            cand = np.concatenate([own, extra])
+            ph = matrix.photo[cand]
+            s = scores[r, cand] - np.where(np.arange(len(cand)) >= len(own), PENALTY_FALLBACK, 0.0)
+            s = s - persist[ph]
+            s = s - np.where(recent[ph], PENALTY_RUN, 0.0)
+            # 사진별 최고점 항목 (동점이면 후보 순서상 앞쪽)
+            order = np.lexsort((np.arange(len(cand)), -s))
+            uniq, first = np.unique(ph[order], return_index=True)
+            cost[k, uniq] = -s[order[first]]
+            choice[k, uniq] = cand[order[first]]
+        reps = -(-len(rows) // n_photo)
+        if reps > 1:
+            # 사진보다 요청이 많은 날 — 재사용 열을 붙인다 (실행 내 중복 페널티)
+            cost = np.concatenate([cost] + [cost + PENALTY_RUN * t for t in range(1, reps)], axis=1)
+            choice = np.tile(choice, (1, reps))
+        cols = _min_cost_assignment(cost)
+        for k, r in enumerate(rows):
+            entry = choice[k, cols[k]]
+            picks[r] = matrix.entries[entry]
+            if day is not None:
+                last_used[matrix.photo[entry]] = day
+    return picks
@@ -0,0 +1,12 @@
+"""
+이미지 선발 dedup 상수 — post_process(파이썬 선발)와 image_engine(numpy 배치 엔진)이 같이 쓴다.
+
+두 경로가 같은 선택을 내려면 같은 값이어야 한다. image_engine은 numpy가 있어야 읽히고
+post_process는 numpy 없이도 돌아야 하므로, 어느 한쪽이 아니라 여기에 둔다.
+점수 = 태그 매칭 점수 + (기사 노이즈 + 이미지 노이즈) / 2 (0.0~0.99) − 아래 페널티.
+"""
+DEDUP_DAYS         = 10       # 영구 dedup이 보는 기간
+PENALTY_PERSISTENT = 100.0    # 최근 DEDUP_DAYS일 안에 쓴 사진
+PENALTY_HISTORY    = 0.2      # 그 전 사용 1건당 — 노이즈 폭(1.0)보다 작게, 태그 점수 차는 못 넘게
+PENALTY_WINDOW     = 50.0     # 최근 선택 창(_dedup_window) 안의 사진
+PENALTY_RUN        = 10000.0  # 이번 실행에서 이미 쓴 사진
@@ -1,24 +1,46 @@
+import os
+import copy
 import re
 import json
 import hashlib
+import time
+import argparse
 from collections import deque
 from pathlib import Path
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString
 
+import card_manifest
 from card_detect import normalize_cards
+from image_penalties import DEDUP_DAYS, PENALTY_HISTORY, PENALTY_PERSISTENT, PENALTY_RUN, PENALTY_WINDOW
+from pattern_scan import MultiPattern
 
 ROOT_DIR       = Path(__file__).resolve().parent.parent
 ARCHIVE_DIR    = ROOT_DIR / "archive"
 BRIEFINGS_JSON = ROOT_DIR / "briefings.json"
+MANIFEST_JSON  = ROOT_DIR / "data" / "post-process-manifest.json"
+IMAGE_LEDGER_JSON = ROOT_DIR / "data" / "image-ledger.json"
+CARD_DETECT_PY = Path(__file__).resolve().parent / "card_detect.py"
+POST_PROCESS_PY = Path(__file__).resolve()
+PATTERN_SCAN_PY = Path(__file__).resolve().parent / "pattern_scan.py"
+IMAGE_PENALTIES_PY = Path(__file__).resolve().parent / "image_penalties.py"
 
 BASE = "https://images.unsplash.com/photo-"
 
 # app.js 캐시 무효화용. app.js를 고칠 때마다 올린다.
-APP_JS_VERSION = 7
+APP_JS_VERSION = 9
 
 # 카드 정규화 집계 — main()에서 리포트로 출력한다 (조용한 실패 방지)
 CARD_STATS = {"daily": [0, 0, []], "weekly": [0, 0, []], "special": [0, 0, []]}
 
+# HTML 파서 백엔드. lxml이 빠르지만 출력이 html.parser와 바이트 단위로 같지 않다
+# (doctype 뒤 개행, 잘못 중첩된 <p> 복구 방식) — --verify-parser로 아카이브 전수 대조
+# 기본값은 html.parser. 대조에서 구조가 다른 파일이 0개가 될 때까지 바꾸지 않는다 (2026-05-20 기준 252개 중 1개)
+HTML_PARSERS = ("html.parser", "lxml")
+HTML_PARSER  = "html.parser"
+
+# 증분 빌드 집계 — 다시 구운 파일 / 매니페스트로 건너뛴 파일
+BUILD_STATS = {"rendered": 0, "cached": 0}
+
 
 def card_kind(date: str) -> str:
     if date.startswith("weekly"):
@@ -58,10 +80,23 @@ HERO_META_KEYS = (
 # 빌드 세션 전역 중복 차단 큐 (직전 5개 이미지 ID 기억)
 _dedup_window: deque = deque(maxlen=15)
 
-# 영구 히스토리 중복 방지 집합 (최근 10일 실물 적용 ID — 빌드간 지속)
-_persistent_dedup_set: set = set()
+# 영구 히스토리 페널티 (photo id → 점수에서 뺄 값 — 빌드간 지속)
+#   최근 DEDUP_DAYS일 안에 쓴 사진은 PENALTY_PERSISTENT, 그 전 사용 이력만 있는 사진은
+#   보존 기간 안 사용 1건당 PENALTY_HISTORY (같은 태그 점수끼리는 덜 쓴 사진이 앞선다)
+_persistent_dedup: dict = {}
 _run_dedup_set: set = set()
 
+# 이미지 사용 원장 (data/image-ledger.json) — photo id → [[날짜, 슬롯], ...] 최근 순.
+# 슬롯은 "thumb" 또는 "seg-N". 일간 브리핑만 기록한다 (기존 briefings.json 스캔과 같은 범위).
+# CI는 post_process 직전에 briefings.json을 시트에서 새로 만들어 썸네일이 비어 있으므로
+# 빌드 간 히스토리는 이 원장에만 남는다. 페널티·기간 상수는 image_penalties에 있다.
+LEDGER_RETENTION_DAYS = 120    # 이보다 오래된 사용 기록은 저장 시 버린다
+_image_ledger: dict = {}
+_ledger_run: dict = {}         # 이번 실행의 기록 — 저장 시 같은 날짜의 이전 기록을 대체한다
+_ledger_run_dates: set = set()
+# 증분 빌드에서 다시 굽지 않는 파일의 지난 선발 (date → 매니페스트 "picks") — 다시 고르지 않는다
+_kept_picks: dict = {}
+
 CATEGORY_PATTERNS = [
     # 순서가 우선순위. 앞 카테고리가 먼저 매칭되면 이후 검사 안 함.
     ("ai",       r'AI|인공지능|LLM|ChatGPT|Gemini|Claude|Grok|딥러닝|머신러닝|GPT|오픈AI|OpenAI|Anthropic'),
@@ -615,6 +650,10 @@ ENTITY_PATTERNS = [
     ("biden",        r'바이든|Biden'),
 ]
 
+# 패턴 목록 전체를 한 번의 스캔으로 — 기사·세그먼트마다 패턴 수만큼 findall을 돌지 않는다
+ENTITY_SCANNER   = MultiPattern(ENTITY_PATTERNS,   re.IGNORECASE)
+CATEGORY_SCANNER = MultiPattern(CATEGORY_PATTERNS, re.IGNORECASE)
+
 ENTITY_IMAGE_MAP = {
 
     # ── 인물 ─────────────────────────────────────────────────────
@@ -1000,12 +1039,76 @@ def _extract_id(url: str) -> str | None:
     return m.group(1) if m else None
 
 
-def load_persistent_dedup() -> None:
+def _days_ago(days: int) -> str:
+    import datetime
+    return (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+
+
+def load_image_ledger() -> bool:
+    global _image_ledger
+    try:
+        data = json.loads(IMAGE_LEDGER_JSON.read_text("utf-8"))
+    except (OSError, ValueError):
+        return False
+    _image_ledger = data.get("photos", {})
+    return True
+
+
+def image_history(photo_id: str, skip_dates: set = frozenset()) -> list:
+    """photo id의 사용 기록 [[날짜, 슬롯], ...] (최근 순). skip_dates의 기록은 뺀다."""
+    return [u for u in _image_ledger.get(photo_id, []) if u[0] not in skip_dates]
+
+
+def record_image_use(date: str, slot: str, url: str) -> None:
+    """이번 실행에서 date의 slot에 url 이미지를 실었다고 원장에 남긴다."""
+    _ledger_run_dates.add(date)
+    pid = _extract_id(url)
+    if pid:
+        _ledger_run.setdefault(pid, []).append([date, slot])
+
+
+def save_image_ledger(retention_days: int = LEDGER_RETENTION_DAYS) -> None:
+    """기존 원장 + 이번 실행 기록. 이번에 다시 기록한 날짜의 이전 기록은 버리고, 보존 기간 밖은 뺀다."""
+    cutoff = _days_ago(retention_days)
+    photos = {}
+    for pid in set(_image_ledger) | set(_ledger_run):
+        uses = [u for u in _image_ledger.get(pid, []) if u[0] not in _ledger_run_dates]
+        uses += _ledger_run.get(pid, [])
+        uses = sorted((u for u in uses if u[0] >= cutoff), reverse=True)
+        if uses:
+            photos[pid] = uses
+    IMAGE_LEDGER_JSON.parent.mkdir(exist_ok=True)
+    IMAGE_LEDGER_JSON.write_text(json.dumps(
+        {"v": 1, "photos": photos}, ensure_ascii=False, indent=1, sort_keys=True) + "\n", "utf-8")
+    print(f"[LEDGER] 사진 {len(photos)}장 / 사용 {sum(map(len, photos.values()))}건 (보존 {retention_days}일)")
+
+
+def load_persistent_dedup(days: int = DEDUP_DAYS, run_dates: set = frozenset()) -> None:
     """
-    기존 briefings.json에서 최근 10일치 실물 썸네일 ID를 읽어
-    _persistent_dedup_set에 로드. 증분 빌드 시 중복 차단에 사용.
+    이미지 원장의 사용 이력으로 _persistent_dedup(photo id → 페널티)을 채운다.
+    최근 days일 안에 쓴 사진은 PENALTY_PERSISTENT, 그 전 이력만 있으면 사용 건수 × PENALTY_HISTORY.
+    run_dates(이번 실행이 다시 고르는 날짜)의 기록은 뺀다 — 지난 실행에서 그 날짜 자신이 고른
+    사진이라, 넣으면 같은 입력으로 다시 돌릴 때마다 자기 선택을 피해 썸네일이 번갈아 바뀐다.
+    (저장 때 save_image_ledger가 같은 날짜의 이전 기록을 버리는 것과 같은 기준)
+    증분 빌드에서 건너뛴 날짜는 지난 선발을 그대로 쓰므로(_kept_picks) 그 기록이 여기 남는다.
+    원장이 아직 없으면(첫 실행) 예전처럼 기존 briefings.json을 훑는다.
     """
-    global _persistent_dedup_set
+    cutoff = _days_ago(days)
+    if load_image_ledger():
+        recent = 0
+        for pid in _image_ledger:
+            uses = image_history(pid, run_dates)
+            if not uses:
+                continue
+            if uses[0][0] >= cutoff:            # 최근 순 — 첫 기록이 마지막 사용
+                _persistent_dedup[pid] = PENALTY_PERSISTENT
+                recent += 1
+            else:
+                _persistent_dedup[pid] = PENALTY_HISTORY * len(uses)
+        print(f"[DEDUP] 원장 — 최근 {days}일 {recent}장 · 그 전 이력 {len(_persistent_dedup) - recent}장 "
+              f"(다시 고르는 날짜 {len(run_dates)}개 제외)")
+        return
+
     if not BRIEFINGS_JSON.exists():
         return
     try:
@@ -1013,21 +1116,18 @@ def load_persistent_dedup() -> None:
     except Exception:
         return
 
-    import datetime
-    cutoff = (datetime.date.today() - datetime.timedelta(days=10)).isoformat()
-
     for briefing in data.get("briefings", []):
         if briefing.get("date", "") < cutoff:
             continue
         tid = _extract_id(briefing.get("thumb_url", ""))
         if tid:
-            _persistent_dedup_set.add(tid)
+            _persistent_dedup[tid] = PENALTY_PERSISTENT
         for seg in briefing.get("segments", []):
             sid = _extract_id(seg.get("thumb_url", ""))
             if sid:
-                _persistent_dedup_set.add(sid)
+                _persistent_dedup[sid] = PENALTY_PERSISTENT
 
-    print(f"[DEDUP] {len(_persistent_dedup_set)}개 히스토리 ID 로드 완료 (최근 10일)")
+    print(f"[DEDUP] {len(_persistent_dedup)}개 히스토리 ID 로드 완료 (briefings.json, 최근 {days}일)")
 
 
 def _hash_noise(title: str, date_str: str) -> float:
@@ -1082,6 +1182,97 @@ def _global_image_candidates() -> list:
     return candidates
 
 
+# ── 이미지 인덱스 (import 시 1회) ─────────────────────────────────
+# 풀마다 "고유 태그 → [(풀 내 위치, 그 이미지에서의 등장 수)]" 역색인을 만들어 둔다.
+# 선발 때는 풀의 고유 태그만 기사 텍스트에 대조하고, 걸린 태그의 이미지에만 점수를 더한다.
+# 카테고리 풀은 이미지 24장·태그 120개가 고유 태그 10개 안팎으로 줄어든다.
+_IMG_NOISE: dict = {}           # photo id → 이미지 고유 노이즈 (md5, 0.00~0.99)
+_POOL_INDEX: dict = {}          # id(pool) → (pool, 태그 역색인)
+_GLOBAL_CANDIDATES: list = []   # _global_image_candidates() 결과 (고정)
+_global_unused: dict = {}       # photo id → 전역 후보 위치. _run_dedup_set에 들어가면 빠진다
+
+# 배치 엔진이 미리 정해 둔 선택 (pool, title, img). 있으면 resolve_image_from_pool이 순서대로 꺼내 쓴다
+_planned_picks: deque = deque()
+
+
+def _img_noise(img_id: str) -> float:
+    noise = _IMG_NOISE.get(img_id)
+    if noise is None:
+        noise = (int(hashlib.md5(img_id.encode()).hexdigest(), 16) % 100) / 100.0
+        _IMG_NOISE[img_id] = noise
+    return noise
+
+
+def _pool_index(pool: list) -> dict:
+    cached = _POOL_INDEX.get(id(pool))
+    if cached is not None and cached[0] is pool:
+        return cached[1]
+    index: dict = {}
+    for pos, img in enumerate(pool):
+        _img_noise(img.get("id", ""))
+        counts: dict = {}
+        for tag in img.get("tags", []):
+            if tag:
+                counts[tag] = counts.get(tag, 0) + 1
+        for tag, n in counts.items():
+            index.setdefault(tag, []).append((pos, n))
+    _POOL_INDEX[id(pool)] = (pool, index)
+    return index
+
+
+def _tag_scores(pool: list, text_lower: str, positions=None) -> dict:
+    """
+    풀 내 위치 → 태그 매칭 점수. 매칭 태그가 없는 이미지는 빠진다 (0점).
+    positions가 주어지면 그 위치만 본다 — 전역 후보는 실행 후반이면 거의 다 쓰여서
+    남은 몇 장의 태그만 보는 편이 역색인 전체(고유 태그 300여 개)를 훑는 것보다 싸다.
+    """
+    scores: dict = {}
+    if positions is None:
+        for tag, postings in _pool_index(pool).items():
+            if tag in text_lower:
+                for pos, n in postings:
+                    scores[pos] = scores.get(pos, 0) + n
+        return scores
+    hit: dict = {}
+    for pos in positions:
+        n = 0
+        for tag in pool[pos].get("tags", []):
+            if not tag:
+                continue
+            found = hit.get(tag)
+            if found is None:
+                found = hit[tag] = tag in text_lower
+            n += found
+        if n:
+            scores[pos] = n
+    return scores
+
+
+def build_image_index() -> None:
+    global _GLOBAL_CANDIDATES
+    for pools in (ENTITY_IMAGE_MAP, CATEGORY_IMAGE_MAP):
+        for pool in pools.values():
+            _pool_index(pool)
+    _pool_index(DEFAULT_IMAGE_POOL)
+    _GLOBAL_CANDIDATES = _global_image_candidates()
+    _pool_index(_GLOBAL_CANDIDATES)
+    _global_unused.clear()
+    for pos, img in enumerate(_GLOBAL_CANDIDATES):
+        if img["id"] not in _run_dedup_set:
+            _global_unused[img["id"]] = pos
+
+
+build_image_index()
+
+
+def mark_image_used(img_id: str) -> None:
+    """선발된 이미지를 세 dedup 구조와 전역 후보 목록에 반영한다."""
+    _dedup_window.append(img_id)
+    _persistent_dedup[img_id] = PENALTY_PERSISTENT
+    _run_dedup_set.add(img_id)
+    _global_unused.pop(img_id, None)
+
+
 def resolve_image_from_pool(
     pool:         list,
     title:        str,
@@ -1093,54 +1284,56 @@ def resolve_image_from_pool(
 
     최종 score = 태그 매칭 점수
                + (기사 노이즈 + 이미지 고유 노이즈) / 2   # 0.0~0.99 범위
-               - 100.0  (영구 히스토리 중복 페널티)
+               - 100.0  (영구 히스토리 중복 페널티 — 그 전 이력만 있으면 0.2 × 사용 건수)
                - 50.0   (세션 윈도우 중복 페널티)
 
     모든 이미지가 페널티 상태여도 최고점 이미지를 반환(폴백 보장).
-    선택된 이미지는 _dedup_window와 _persistent_dedup_set 양쪽에 등록.
+    선택된 이미지는 _dedup_window와 _persistent_dedup 양쪽에 등록.
+    태그 점수·노이즈는 import 시 만든 이미지 인덱스에서 읽는다.
     """
+    if _planned_picks:
+        want_pool, want_title, img = _planned_picks.popleft()
+        if want_pool is not pool or want_title != title:
+            raise RuntimeError(f"[ENGINE] 선발 계획과 호출 순서가 어긋났다: {date_str} {title[:40]}")
+        mark_image_used(img.get("id", ""))
+        return img
+
     text_lower  = article_text.lower()
     base_noise  = _hash_noise(title, date_str)
-    candidates  = pool
 
     best_img    = None
     best_score  = float("-inf")
 
+    candidates = [(pool, range(len(pool)), _tag_scores(pool, text_lower))]
     if pool and all(img.get("id", "") in _run_dedup_set for img in pool):
-        candidates = pool + [
-            img for img in _global_image_candidates()
-            if img.get("id", "") not in _run_dedup_set
-        ]
-
-    for img in candidates:
-        img_id = img.get("id", "")
-
-        # 태그 매칭 점수 (정수)
-        tag_score = sum(1.0 for tag in img.get("tags", []) if tag and tag in text_lower)
-
-        # 이미지 고유 결정론적 노이즈 (이미지마다 다른 값으로 분산)
-        img_noise = (int(hashlib.md5(img_id.encode()).hexdigest(), 16) % 100) / 100.0
-        score = tag_score + (base_noise + img_noise) / 2.0
-
-        # 페널티 적용
-        if img_id in _persistent_dedup_set:
-            score -= 100.0
-        if img_id in _dedup_window:
-            score -= 50.0
-        if img_id in _run_dedup_set:
-            score -= 10000.0
-
-        if score > best_score:
-            best_score = score
-            best_img   = img
+        # 풀 소진 — 이번 실행에서 아직 안 쓴 전역 후보를 뒤에 붙인다 (문서 순서 유지)
+        unused = list(_global_unused.values())
+        candidates.append((_GLOBAL_CANDIDATES, unused,
+                           _tag_scores(_GLOBAL_CANDIDATES, text_lower, unused)))
+
+    for source, positions, tag_scores in candidates:
+        for pos in positions:
+            img    = source[pos]
+            img_id = img.get("id", "")
+
+            # 태그 매칭 점수 (정수) + 이미지 고유 결정론적 노이즈
+            score = float(tag_scores.get(pos, 0)) + (base_noise + _img_noise(img_id)) / 2.0
+
+            # 페널티 적용
+            score -= _persistent_dedup.get(img_id, 0.0)
+            if img_id in _dedup_window:
+                score -= PENALTY_WINDOW
+            if img_id in _run_dedup_set:
+                score -= PENALTY_RUN
+
+            if score > best_score:
+                best_score = score
+                best_img   = img
 
     if best_img is None:
         best_img = pool[0]
 
-    img_id = best_img.get("id", "")
-    _dedup_window.append(img_id)
-    _persistent_dedup_set.add(img_id)
-    _run_dedup_set.add(img_id)
+    mark_image_used(best_img.get("id", ""))
     return best_img
 
 
@@ -1206,9 +1399,10 @@ def detect_entity(title: str, summary: str) -> str | None:
     best_entity = None
     best_score  = 0.0
 
-    for entity_key, pattern in ENTITY_PATTERNS:
-        score  = len(re.findall(pattern, title,   re.IGNORECASE)) * 3.0
-        score += len(re.findall(pattern, summary, re.IGNORECASE)) * 1.0
+    title_counts   = ENTITY_SCANNER.counts(title)
+    summary_counts = ENTITY_SCANNER.counts(summary)
+    for entity_key, t, s in zip(ENTITY_SCANNER.keys, title_counts, summary_counts):
+        score = t * 3.0 + s * 1.0
 
         if score > best_score:
             best_score  = score
@@ -1229,10 +1423,10 @@ def detect_category(title: str, summary: str) -> str | None:
     best_cat   = None
     best_score = 0.0
 
-    for category_key, pattern in CATEGORY_PATTERNS:
+    for category_key, spans in zip(CATEGORY_SCANNER.keys, CATEGORY_SCANNER.spans(text)):
         score = 0.0
-        for m in re.finditer(pattern, text, re.IGNORECASE):
-            pos_weight = 1.0 - (m.start() / text_len) * 0.9
+        for start, _ in spans:
+            pos_weight = 1.0 - (start / text_len) * 0.9
             score += pos_weight
 
         if score > best_score:
@@ -1288,27 +1482,38 @@ def make_urls(img_meta: dict) -> dict:
 
 def resolve_image(soup: BeautifulSoup, title: str,
                   date_str: str, summary: str) -> tuple[dict, str]:
-    article_text = f"{title} {summary}"
-
     # Priority 1: 기사 본문 이미지
     art = find_article_image(soup)
     if art:
         return art, "article_image"
+    return resolve_handpicked_image(title, date_str, summary)
+
 
-    # Priority 2: 엔티티 우선 매칭
+def choose_image_pool(title: str, summary: str) -> tuple[list, str | None, str | None]:
+    """
+    엔티티 → 카테고리 → 기본 순으로 선발 풀을 고른다. 반환: (풀, entity, category).
+    텍스트만 보므로 결과가 앞선 선발과 무관하다 — 선발 계획(collect_image_requests)이 이 점에 기댄다.
+    """
     entity = detect_entity(title, summary)
     if entity and entity in ENTITY_IMAGE_MAP:
-        img = resolve_image_from_pool(ENTITY_IMAGE_MAP[entity], title, date_str, article_text)
-        return img, f"entity:{entity}"
-
-    # Priority 3: 카테고리 스코어링
+        return ENTITY_IMAGE_MAP[entity], entity, None
     cat = detect_category(title, summary)
     if cat and cat in CATEGORY_IMAGE_MAP:
-        img = resolve_image_from_pool(CATEGORY_IMAGE_MAP[cat], title, date_str, article_text)
-        return img, "smart_pick"
+        return CATEGORY_IMAGE_MAP[cat], None, cat
+    return DEFAULT_IMAGE_POOL, None, cat
+
+
+def resolve_handpicked_image(title: str, date_str: str, summary: str) -> tuple[dict, str]:
+    """본문 이미지가 없을 때의 선발 (Priority 2~4). HTML을 보지 않으므로 증분 빌드에서도 그대로 돈다."""
+    article_text = f"{title} {summary}"
 
-    # Priority 4: Default
-    img = resolve_image_from_pool(DEFAULT_IMAGE_POOL, title, date_str, article_text)
+    # Priority 2: 엔티티 우선 매칭 / Priority 3: 카테고리 스코어링 / Priority 4: Default
+    pool, entity, cat = choose_image_pool(title, summary)
+    img = resolve_image_from_pool(pool, title, date_str, article_text)
+    if entity:
+        return img, f"entity:{entity}"
+    if pool is not DEFAULT_IMAGE_POOL:
+        return img, "smart_pick"
     return img, "handpick_default"
 
 
@@ -1382,6 +1587,10 @@ FOOTER_HTML = """<footer class="reader-footer">
 def remove_previous_reader_chrome(soup: BeautifulSoup) -> None:
     for selector in ("nav.reader-nav", ".reader-hero", "footer.reader-footer"):
         for tag in soup.select(selector):
+            # FOOTER_HTML의 </footer>와 <script> 사이 개행 — 남기면 다시 구울 때마다 개행이 쌓인다
+            nxt = tag.next_sibling
+            if tag.name == "footer" and isinstance(nxt, NavigableString) and not nxt.strip():
+                nxt.extract()
             tag.decompose()
     for script in soup.find_all("script"):
         if script.string and "hong4137-briefing" in script.string:
@@ -1408,38 +1617,157 @@ def ensure_reader_mode(body) -> None:
     body["class"] = existing
 
 
-def process_article(html_path: Path, briefing_meta: dict) -> dict:
-    """단일 기사 HTML 변환. 반환: briefings.json 갱신용 thumb 메타 dict."""
-    soup  = BeautifulSoup(html_path.read_text("utf-8"), "html.parser")
-    title = briefing_meta.get("title", "")
-    date  = briefing_meta.get("date", "")
-    summ  = briefing_meta.get("summary", "")
+# GNB·푸터 조각은 한 번만 파싱해 두고 파일마다 깊은 복사로 붙인다.
+# 조각이라 백엔드와 무관하게 html.parser로 읽는다 (lxml은 <html><body>로 감싼다)
+_CHROME: dict = {}
 
-    img_meta, source = resolve_image(soup, title, date, summ)
-    urls = make_urls(img_meta)
+
+def chrome_fragment(html: str) -> BeautifulSoup:
+    if html not in _CHROME:
+        _CHROME[html] = BeautifulSoup(html, "html.parser")
+    return copy.deepcopy(_CHROME[html])
+
+
+def resolve_parser(name: str) -> str:
+    """lxml이 설치돼 있지 않으면 html.parser로 내려간다."""
+    if name == "lxml":
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            print("[PARSER] lxml 없음 — html.parser로 진행")
+            return "html.parser"
+    return name
+
+
+def render_article(html_text: str, kind: str, parser: str | None = None) -> dict:
+    """
+    이미지 선발을 뺀 HTML 변환. 결과는 입력 HTML과 kind(와 파서 백엔드)만으로 정해진다.
+    반환: {"html": 변환본 (head/body가 없으면 None), "article_image": 본문 이미지 메타 | None,
+           "card_count": 카드 수, "cards"·"search": 카드 매니페스트 레코드 (card_manifest.py)}
+    """
+    soup = BeautifulSoup(html_text, parser or HTML_PARSER)
+    art  = find_article_image(soup)
 
     head = soup.find("head")
     body = soup.find("body")
     if head is None or body is None:
-        return {"thumb_category": "default"}
+        return {"html": None, "article_image": art, "card_count": 0}
 
     remove_previous_reader_chrome(soup)
     ensure_theme_link(soup)
     ensure_app_script(soup)
     ensure_reader_mode(body)
 
-    kind = card_kind(date)
     card_count = normalize_cards(soup, kind)
+
+    body.insert(0, chrome_fragment(GNB_HTML))
+    body.append(chrome_fragment(FOOTER_HTML))
+
+    html = str(soup)
+    return {"html": html, "article_image": art, "card_count": card_count,
+            "cards": card_manifest.soup_cards(soup), "search": card_manifest.soup_search(soup)}
+
+
+def render_file(html_path: Path, kind: str, parser: str | None = None) -> dict:
+    """
+    render_article + 파일 기록. 병렬 단계의 작업 단위라 모듈 전역 상태를 건드리지 않는다.
+    반환은 매니페스트 항목 형태: {"html": 기록한 HTML 해시 | None, "article_image", "card_count"}
+    + 카드 매니페스트용 "cards"·"search" (빌드 매니페스트에는 싣지 않는다)
+    """
+    rendered = render_article(html_path.read_text("utf-8"), kind, parser)
+    digest = None
+    if rendered["html"] is not None:
+        html_path.write_text(rendered["html"], "utf-8")
+        digest = _sha(rendered["html"])
+    return {"html": digest, "article_image": rendered["article_image"],
+            "card_count": rendered["card_count"],
+            "cards": rendered["cards"], "search": rendered["search"]}
+
+
+def _render_job(job: tuple) -> dict:
+    return render_file(*job)
+
+
+def render_all(lists: list, incremental: bool = False, workers: int = 1) -> dict:
+    """
+    병렬 단계. 모든 목록의 HTML 변환을 먼저 끝내 둔다.
+    반환: {html_path: render_file 결과 또는 매니페스트 항목}. 이미지 선발은 하지 않는다 —
+    dedup 상태를 공유하므로 _process_list의 직렬 단계에서 목록 순서대로 한다.
+    """
+    rendered, jobs = {}, []
+    for items in lists:
+        for item in items:
+            html_path = ARCHIVE_DIR / f"{item.get('date', '')}.html"
+            if html_path in rendered or not html_path.exists():
+                continue
+            entry = fresh_manifest_entry(html_path, item) if incremental else None
+            if entry is not None:
+                rendered[html_path] = entry
+                BUILD_STATS["cached"] += 1
+            else:
+                jobs.append((html_path, card_kind(item.get("date", "")), HTML_PARSER))
+
+    if workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as ex:
+            results = list(ex.map(_render_job, jobs, chunksize=4))
+    else:
+        results = [_render_job(job) for job in jobs]
+
+    for (html_path, _, _), result in zip(jobs, results):
+        rendered[html_path] = result
+        BUILD_STATS["rendered"] += 1
+    return rendered
+
+
+def process_article(html_path: Path, briefing_meta: dict, rendered: dict | None = None) -> dict:
+    """
+    단일 기사 HTML 변환. 반환: briefings.json 갱신용 thumb 메타 dict.
+    rendered는 render_all이 미리 만들어 둔 결과(또는 증분 빌드의 매니페스트 항목)다.
+    없으면 여기서 직접 변환한다. 이미지 선발은 어느 경우든 여기서 돈다 —
+    dedup 상태가 앞 파일들의 선택에 따라 달라지기 때문이다. 단 증분 빌드에서 건너뛴 파일은
+    지난 선발(_kept_picks)을 그대로 돌려준다.
+    """
+    title = briefing_meta.get("title", "")
+    date  = briefing_meta.get("date", "")
+    summ  = briefing_meta.get("summary", "")
+    kind  = card_kind(date)
+
+    if rendered is None:
+        rendered = render_file(html_path, kind)
+        BUILD_STATS["rendered"] += 1
+    art = rendered["article_image"]
+    entry = None
+    if rendered["html"] is not None:
+        entry = {
+            "html":          rendered["html"],
+            "row":           row_fingerprint(briefing_meta),
+            "article_image": art,
+            "card_count":    rendered["card_count"],
+        }
+
+    kept = _kept_picks.get(date)
+    if kept is not None:
+        img_meta = source = None
+    elif art:
+        img_meta, source = art, "article_image"
+    else:
+        img_meta, source = resolve_handpicked_image(title, date, summ)
+
+    if entry is None:
+        return {"thumb_category": "default"}
+    _manifest_next[date] = entry
+
+    card_count = entry["card_count"]
     st = CARD_STATS[kind]
     st[0] += 1
     st[1] += card_count
     if card_count == 0:
         st[2].append(date)
+    if kept is not None:
+        return dict(kept["meta"], card_count=card_count)   # 새로 고를 때와 같은 키 순서
 
-    body.insert(0, BeautifulSoup(GNB_HTML, "html.parser"))
-    body.append(BeautifulSoup(FOOTER_HTML, "html.parser"))
-
-    html_path.write_text(str(soup), "utf-8")
+    urls = make_urls(img_meta)
 
     cat = source if source.startswith("entity:") else (detect_category(title, summ) or "default")
 
@@ -1458,6 +1786,97 @@ def process_article(html_path: Path, briefing_meta: dict) -> dict:
     }
 
 
+# ── 증분 빌드 매니페스트 ──────────────────────────────────────────
+# 파일별로 "마지막으로 써 둔 HTML 해시 + 브리핑 행 지문"을 남긴다. 다음 실행에서
+# 디스크의 파일이 그 해시와 같으면(= Drive 동기화가 덮어쓰지 않았으면) 건너뛴다.
+# 모든 파일에 공통으로 영향을 주는 입력(app.js 버전·크롬 템플릿·카드 탐지 코드·이 파일과
+# pattern_scan·image_penalties의 소스 — 렌더 함수, 엔티티·카테고리 패턴, 선발 페널티가 여기 있다)은
+# build 지문 하나로 묶는다. 바뀌면 매니페스트를 통째로 버리고 전체를 다시 굽는다.
+_manifest_prev: dict = {}
+_manifest_next: dict = {}
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def build_fingerprint() -> str:
+    parts = [str(APP_JS_VERSION), GNB_HTML, FOOTER_HTML, CARD_DETECT_PY.read_text("utf-8"), HTML_PARSER,
+             card_manifest.code_version(), POST_PROCESS_PY.read_text("utf-8"), PATTERN_SCAN_PY.read_text("utf-8"),
+             IMAGE_PENALTIES_PY.read_text("utf-8")]
+    return _sha("\0".join(parts))
+
+
+def row_fingerprint(item: dict) -> str:
+    """process_article이 읽는 브리핑 행 필드만. thumb_* 등 스스로 써 넣는 필드는 제외."""
+    return _sha("\0".join(item.get(k, "") for k in ("date", "title", "summary")))
+
+
+def fresh_manifest_entry(html_path: Path, item: dict) -> dict | None:
+    entry = _manifest_prev.get(item.get("date", ""))
+    if not entry or entry.get("row") != row_fingerprint(item):
+        return None
+    if entry.get("html") != hashlib.sha256(html_path.read_bytes()).hexdigest():
+        return None
+    return entry
+
+
+def load_build_manifest() -> None:
+    global _manifest_prev
+    if not MANIFEST_JSON.exists():
+        print("[INCR] 매니페스트 없음 — 전체 빌드")
+        return
+    try:
+        data = json.loads(MANIFEST_JSON.read_text("utf-8"))
+    except Exception:
+        print("[INCR] 매니페스트 손상 — 전체 빌드")
+        return
+    if data.get("build") != build_fingerprint():
+        print("[INCR] 빌드 지문 변경 (APP_JS_VERSION·크롬·카드 탐지·카드 레코드 코드) — 전체 빌드")
+        return
+    _manifest_prev = data.get("files", {})
+    print(f"[INCR] 매니페스트 {len(_manifest_prev)}개 파일 로드")
+
+
+def save_build_manifest() -> None:
+    MANIFEST_JSON.parent.mkdir(exist_ok=True)
+    MANIFEST_JSON.write_text(json.dumps(
+        {"v": 1, "build": build_fingerprint(), "files": _manifest_next},
+        ensure_ascii=False, indent=1, sort_keys=True) + "\n", "utf-8")
+
+
+def save_card_manifest(rendered: dict) -> None:
+    """
+    data/cards.json — 파일별 카드·검색 레코드 (card_manifest.py). 이번에 구운 파일은 변환 결과를,
+    증분 빌드로 건너뛴 파일은 기존 항목을 그대로 쓴다. 기존 항목이 없으면 디스크 HTML에서 한 번 뽑는다.
+    (레코드 코드가 바뀌었으면 card_manifest.load()가 빈 dict라 전부 다시 뽑는다)
+    """
+    prev = card_manifest.load()
+    out = {}
+    for html_path, entry in rendered.items():
+        if entry["html"] is None:
+            continue
+        if "cards" in entry:
+            out[html_path.name] = {"html": entry["html"], "cards": entry["cards"],
+                                   "search": entry["search"]}
+            continue
+        old = prev.get(html_path.name)
+        if old and old.get("html") == entry["html"]:
+            out[html_path.name] = old
+            continue
+        text = html_path.read_text("utf-8")
+        out[html_path.name] = {"html": entry["html"], "cards": card_manifest.parse_cards(text),
+                               "search": card_manifest.parse_search(text)}
+    card_manifest.CARDS_JSON.parent.mkdir(exist_ok=True)
+    # 파일당 한 줄 — 증분 빌드에서 바뀐 파일의 줄만 diff에 나온다
+    lines = [json.dumps(card_manifest.CODE_KEY) + ":" + json.dumps(card_manifest.code_version())]
+    lines += [json.dumps(name, ensure_ascii=False) + ":"
+             + json.dumps(out[name], ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+             for name in sorted(out)]
+    card_manifest.CARDS_JSON.write_text("{\n" + ",\n".join(lines) + "\n}\n", "utf-8")
+    print(f"[CARDS] 카드 매니페스트 {len(out)}개 파일 → {card_manifest.CARDS_JSON.relative_to(ROOT_DIR)}")
+
+
 def get_log_source(meta: dict) -> str:
     if meta.get("hero_source"):
         return meta["hero_source"]
@@ -1468,11 +1887,8 @@ def get_log_source(meta: dict) -> str:
     return "handpick_category"
 
 
-def build_segments_with_images(raw_title: str, raw_summary: str, date_str: str) -> list:
-    """
-    타이틀 파이프 분할 + 요약 비례 배분 + 세그먼트별 독립 이미지 매칭.
-    반환: [{title, summary, thumb_url, thumb_url_xs, thumb_alt, thumb_category}, ...]
-    """
+def split_segments(raw_title: str, raw_summary: str) -> list:
+    """타이틀 파이프 분할 + 요약 문장 비례 배분. 반환: [(title, summary), ...]"""
     titles    = parse_title_segments(raw_title)
     sentences = parse_summary_sentences(raw_summary)
 
@@ -1482,7 +1898,7 @@ def build_segments_with_images(raw_title: str, raw_summary: str, date_str: str)
     n        = len(titles)
     per_slot = len(sentences) // n if sentences else 0
     remain   = len(sentences) % n if sentences else 0
-    segments = []
+    pairs    = []
     cursor   = 0
 
     for i, title in enumerate(titles):
@@ -1490,23 +1906,28 @@ def build_segments_with_images(raw_title: str, raw_summary: str, date_str: str)
         chunk   = sentences[cursor:cursor + count]
         summary = '. '.join(chunk) + ('.' if chunk else '')
         cursor += count
+        pairs.append((title, summary))
 
-        seg_text = title + " " + summary
+    return pairs
 
-        # Priority A: 엔티티 우선 매칭
-        entity = detect_entity(title, summary)
-        if entity and entity in ENTITY_IMAGE_MAP:
-            img_meta = resolve_image_from_pool(ENTITY_IMAGE_MAP[entity], title, date_str, seg_text)
-            cat      = f"entity:{entity}"
 
-        else:
-            # Priority B: 카테고리 스코어링 (기존 로직)
-            cat = detect_category(title, summary)
-            if cat and cat in CATEGORY_IMAGE_MAP:
-                img_meta = resolve_image_from_pool(CATEGORY_IMAGE_MAP[cat], title, date_str, seg_text)
-            else:
-                img_meta = resolve_image_from_pool(DEFAULT_IMAGE_POOL, title, date_str, seg_text)
-                cat = "default"
+def build_segments_with_images(raw_title: str, raw_summary: str, date_str: str) -> list:
+    """
+    타이틀 파이프 분할 + 요약 비례 배분 + 세그먼트별 독립 이미지 매칭.
+    반환: [{title, summary, thumb_url, thumb_url_xs, thumb_alt, thumb_category}, ...]
+    """
+    segments = []
+
+    for title, summary in split_segments(raw_title, raw_summary):
+        seg_text = title + " " + summary
+
+        # Priority A: 엔티티 우선 매칭 / Priority B: 카테고리 스코어링 (기존 로직)
+        pool, entity, cat = choose_image_pool(title, summary)
+        img_meta = resolve_image_from_pool(pool, title, date_str, seg_text)
+        if entity:
+            cat = f"entity:{entity}"
+        elif pool is DEFAULT_IMAGE_POOL:
+            cat = "default"
 
         urls = make_urls(img_meta)
         segments.append({
@@ -1521,7 +1942,7 @@ def build_segments_with_images(raw_title: str, raw_summary: str, date_str: str)
     return segments
 
 
-def _process_list(items: list, label: str) -> None:
+def _process_list(items: list, label: str, rendered: dict | None = None) -> None:
     """briefings / weekly / specials 공통 후처리 루프."""
     for item in items:
         for key in HERO_META_KEYS:
@@ -1539,32 +1960,187 @@ def _process_list(items: list, label: str) -> None:
                 item.setdefault("thumb_alt",      "")
                 item.setdefault("thumb_category", "default_safeguard")
                 print(f"[SAFEGUARD] {date} thumb_url 누락 → 기본 이미지 주입")
+            if label == "briefing":
+                record_image_use(date, "thumb", item.get("thumb_url", ""))
             continue
 
-        meta = process_article(html_path, item)
+        meta = process_article(html_path, item, (rendered or {}).get(html_path))
         item.update(meta)
         item.pop("segments", None)
         raw_title   = item.get("title", "")
         raw_summary = item.get("summary", "")
-        segs = build_segments_with_images(raw_title, raw_summary, date)
+        kept = _kept_picks.get(date)
+        if kept is not None:
+            segs = [dict(pairs) for pairs in kept["segments"]]
+        else:
+            segs = build_segments_with_images(raw_title, raw_summary, date)
         if segs:
             item["segments"] = segs
+        if date in _manifest_next:
+            # 다음 증분 빌드가 이 파일을 건너뛰면 이 선발을 그대로 쓴다.
+            # [키, 값] 쌍으로 둔다 — 매니페스트는 키를 정렬해 저장하는데 briefings.json의 키 순서는 지켜야 한다
+            _manifest_next[date]["picks"] = {
+                "meta": [[k, v] for k, v in meta.items() if k != "card_count"],
+                "segments": [[[k, v] for k, v in seg.items()] for seg in segs]}
+        if label == "briefing":
+            record_image_use(date, "thumb", item.get("thumb_url", ""))
+            for i, seg in enumerate(segs):
+                record_image_use(date, f"seg-{i}", seg.get("thumb_url", ""))
         print(f"  -> {len(segs)} segments: {[s['thumb_category'] for s in segs]}")
         print(f"[OK-{label}] {date} cat={meta['thumb_category']} src={get_log_source(meta)}")
 
 
-def main():
-    load_persistent_dedup()
+def collect_image_requests(lists: list, rendered: dict) -> list:
+    """
+    직렬 단계가 resolve_image_from_pool을 부를 순서 그대로의 요청 목록.
+    풀 선택은 텍스트만 보므로(choose_image_pool) 선발 결과를 몰라도 미리 정해진다.
+    반환: [(pool, title, date_str, article_text), ...]
+    """
+    requests = []
+    for items, _ in lists:
+        for item in items:
+            date      = item.get("date", "")
+            title     = item.get("title", "")
+            summ      = item.get("summary", "")
+            html_path = ARCHIVE_DIR / f"{date}.html"
+            if not html_path.exists():
+                if not item.get("thumb_url"):
+                    requests.append((DEFAULT_IMAGE_POOL, title, date, ""))
+                continue
+            if date in _kept_picks:
+                continue
+            if not rendered[html_path]["article_image"]:
+                pool, _, _ = choose_image_pool(title, summ)
+                requests.append((pool, title, date, f"{title} {summ}"))
+            for seg_title, seg_summ in split_segments(title, summ):
+                pool, _, _ = choose_image_pool(seg_title, seg_summ)
+                requests.append((pool, seg_title, date, seg_title + " " + seg_summ))
+    return requests
+
+
+def plan_image_picks(lists: list, rendered: dict, engine: str = "numpy", dedup_days: int = DEDUP_DAYS) -> bool:
+    """
+    배치 엔진으로 실행 전체의 선택을 미리 정한다. numpy가 없으면 False (파이썬 경로).
+    numpy: greedy — 파이썬 경로와 같은 선택. assign: 날짜별 최소 비용 배정 (순서 무관).
+    """
+    try:
+        import image_engine
+    except ImportError:
+        print("[ENGINE] numpy 없음 — 파이썬 선발로 진행")
+        return False
+    t0 = time.perf_counter()
+    requests = collect_image_requests(lists, rendered)
+    pools = [*ENTITY_IMAGE_MAP.values(), *CATEGORY_IMAGE_MAP.values(), DEFAULT_IMAGE_POOL]
+    matrix = image_engine.ImageMatrix(pools, _GLOBAL_CANDIDATES, _img_noise)
+    if engine == "assign":
+        picks = image_engine.assign_picks(matrix, requests, _hash_noise,
+                                          persistent=_persistent_dedup, window_days=dedup_days)
+    else:
+        picks = image_engine.greedy_picks(
+            matrix, requests, _hash_noise,
+            persistent=_persistent_dedup, window=_dedup_window, run=_run_dedup_set,
+            window_size=_dedup_window.maxlen)
+    _planned_picks.extend((pool, title, img) for (pool, title, _, _), img in zip(requests, picks))
+    print(f"[ENGINE] {engine} — 요청 {len(requests)}건 × 이미지 {len(matrix.entries)}장 "
+          f"({time.perf_counter() - t0:.2f}s)")
+    return True
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="아카이브 HTML 후처리 + briefings.json 이미지 매핑")
+    ap.add_argument("--incremental", action="store_true",
+                    help="매니페스트상 입력이 바뀌지 않은 파일은 다시 굽지 않는다")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="HTML 변환 프로세스 수 (1이면 직렬). 이미지 선발은 항상 직렬이다")
+    ap.add_argument("--engine", choices=("python", "numpy", "assign"), default="python",
+                    help="이미지 선발 엔진. numpy는 실행 전체를 한 번에 채점한다 (선택 결과 동일). "
+                         "assign은 날짜별 최소 비용 배정 (최근 --dedup-days일 사용분 회피) — 처리 순서와 무관한 결과")
+    ap.add_argument("--dedup-days", type=int, default=DEDUP_DAYS,
+                    help="이미지 원장에서 최근 며칠 안에 쓴 사진을 피할지")
+    ap.add_argument("--ledger-retention", type=int, default=LEDGER_RETENTION_DAYS,
+                    help="이미지 원장에 사용 기록을 며칠까지 남길지")
+    ap.add_argument("--parser", choices=HTML_PARSERS, default="html.parser",
+                    help="HTML 파서 백엔드. lxml은 없으면 html.parser로 내려간다")
+    ap.add_argument("--verify-parser", action="store_true",
+                    help="아카이브 전체를 두 백엔드로 변환해 결과를 대조만 하고 끝낸다 (파일은 쓰지 않음). "
+                         "종료 코드: 0 일치 / 1 구조 다른 파일 있음 / 2 lxml 없어 건너뜀")
+    return ap.parse_args(argv)
+
+
+def _collapse_ws(html: str) -> str:
+    return re.sub(r">\s+<", "><", html).strip()
+
+
+def verify_parser_backends() -> int:
+    """
+    archive/*.html 전수를 html.parser와 lxml로 변환해 대조한다. 반환: 실질 차이가 있는 파일 수,
+    lxml이 없어 대조하지 못했으면 None (통과로 치지 않는다).
+    카드 수·본문 이미지·태그 사이 공백을 접은 HTML이 같으면 '같음'으로 본다 —
+    lxml은 doctype 뒤 개행을 버리므로 바이트 비교는 전 파일이 다르다.
+    """
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        print("[PARSER] 대조 건너뜀 — lxml이 설치돼 있지 않다")
+        return None
+    same = ws_only = 0
+    bad = []
+    for html_path in sorted(ARCHIVE_DIR.glob("*.html")):
+        text = html_path.read_text("utf-8")
+        kind = card_kind(html_path.stem)
+        a = render_article(text, kind, "html.parser")
+        b = render_article(text, kind, "lxml")
+        if a == b:
+            same += 1
+        elif (a["card_count"], a["article_image"]) == (b["card_count"], b["article_image"]) \
+                and _collapse_ws(a["html"] or "") == _collapse_ws(b["html"] or ""):
+            ws_only += 1
+        else:
+            bad.append(html_path.name)
+    print(f"[PARSER] 동일 {same}개 / 공백만 다름 {ws_only}개 / 구조 다름 {len(bad)}개")
+    for name in bad:
+        print(f"[PARSER]   {name}")
+    return len(bad)
+
+
+def main(argv=None):
+    global HTML_PARSER
+    args = parse_args(argv)
+    HTML_PARSER = resolve_parser(args.parser)
+    if args.verify_parser:
+        bad = verify_parser_backends()
+        raise SystemExit(2 if bad is None else 1 if bad else 0)
     data = json.loads(BRIEFINGS_JSON.read_text("utf-8"))
-
-    _process_list(data.get("briefings", []), "briefing")
-    _process_list(data.get("weekly",    []), "weekly")
-    _process_list(data.get("specials",  []), "special")
+    if args.incremental:
+        load_build_manifest()
+    lists = [(data.get("briefings", []), "briefing"),
+             (data.get("weekly",    []), "weekly"),
+             (data.get("specials",  []), "special")]
+
+    # 1) 병렬 — 파싱·카드 정규화·직렬화·기록
+    rendered = render_all([items for items, _ in lists], args.incremental, args.workers)
+    # 건너뛴 파일(매니페스트 항목)은 지난 선발을 쓰고, 원장의 그 기록은 나머지 날짜의 선발에 페널티로 든다.
+    # 원장 기록은 일간 브리핑만 — _process_list가 record_image_use를 부르는 범위와 같다
+    _kept_picks.update((p.stem, e["picks"]) for p, e in rendered.items() if "picks" in e)
+    load_persistent_dedup(args.dedup_days,
+                          {b.get("date", "") for b in data.get("briefings", [])} - _kept_picks.keys())
+    # 2) 직렬 — 이미지 선발 (dedup 상태 공유, 목록 순서가 곧 결과)
+    if args.engine != "python":
+        plan_image_picks(lists, rendered, args.engine, args.dedup_days)
+    for items, label in lists:
+        _process_list(items, label, rendered)
+    if _planned_picks:
+        raise RuntimeError(f"[ENGINE] 쓰이지 않은 선발 계획 {len(_planned_picks)}건")
 
     BRIEFINGS_JSON.write_text(
         json.dumps(data, ensure_ascii=False, indent=2), "utf-8"
     )
+    save_build_manifest()
+    save_card_manifest(rendered)
+    save_image_ledger(args.ledger_retention)
     report_cards()
+    print(f"[INCR] 렌더 {BUILD_STATS['rendered']}개 / 건너뜀 {BUILD_STATS['cached']}개 "
+          f"(지난 이미지 선발 유지 {len(_kept_picks)}개)")
     print("[DONE] briefings.json updated.")
 
 
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+빌드 점검 — verify-build 워크플로가 스크립트를 고친 PR·주 1회·수동 실행 때 돌린다. 저장소에는 아무것도
+쓰지 않는다. sync마다 돌리기엔 무겁다 (전체 빌드 2회 — 약 30초, 증분 빌드는 1초 미만).
+
+  python scripts/verify_build.py [점검 ...]      (점검을 안 주면 전부)
+
+  rebuild : 저장소 사본에서 post_process 전체 빌드를 두 번 돌려 archive/ · data/ · briefings.json이
+            바이트 단위로 같은지 본다. 같은 입력에 썸네일이 번갈아 바뀌면 sync마다 수백 줄이
+            커밋된다 (이미지 원장이 자기 날짜의 지난 선택을 피하게 만들던 버그가 그랬다).
+  cards   : archive/*.html 전수에서 card_detect의 단일 순회 탐지와 예전 구현(셀렉터별 select()
+            + descendants 검사, 아래 _legacy_detect_cards)이 같은 카드를 같은 순서로 잡는지 본다.
+  patterns: briefings.json의 제목·요약에서 pattern_scan 스캐너(post_process.detect_entity ·
+            detect_category)와 search-index.json 기사에서 LiteralScanner(extract_keywords)가
+            예전의 패턴별 IGNORECASE 루프(아래 _legacy_*)와 같은 결과를 내는지 본다.
+
+하나라도 어긋나면 종료 코드 1 — 워크플로가 실패로 끝난다.
+"""
+import hashlib
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import card_detect
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 사본에 가져가지 않는 것 — post_process가 읽지 않고 크기만 크다
+COPY_IGNORE = shutil.ignore_patterns(".git", ".cache", "deep", "search", "out", "__pycache__")
+
+
+def _snapshot(root):
+    """post_process가 쓰는 파일들의 {상대 경로: sha256}."""
+    paths = [root / "briefings.json", *(root / "archive").glob("*.html"), *(root / "data").glob("*.json")]
+    return {str(p.relative_to(root)): hashlib.sha256(p.read_bytes()).hexdigest()
+            for p in paths if p.is_file()}
+
+
+def check_rebuild() -> int:
+    """전체 빌드 두 번의 결과 대조. 반환: 달라진 파일 수."""
+    with tempfile.TemporaryDirectory(prefix="verify-build-") as tmp:
+        tree = Path(tmp) / "repo"
+        shutil.copytree(ROOT, tree, ignore=COPY_IGNORE)
+        snaps = []
+        for _ in range(2):
+            subprocess.run([sys.executable, str(tree / "scripts" / "post_process.py")],
+                           cwd=tree, check=True, stdout=subprocess.DEVNULL)
+            snaps.append(_snapshot(tree))
+    first, second = snaps
+    bad = sorted(k for k in first.keys() | second.keys() if first.get(k) != second.get(k))
+    for name in bad[:20]:
+        print(f"[REBUILD]   {name}")
+    print(f"[REBUILD] 전체 빌드 2회 — 파일 {len(first)}개 중 달라진 파일 {len(bad)}개")
+    return len(bad)
+
+
+# ── cards ─────────────────────────────────────────────────────────
+def _legacy_detect_cards(soup, kind="daily"):
+    """셀렉터별 select() + descendants 포함 검사 — 단일 순회 전환 전 구현 그대로."""
+    body = soup.find("body") or soup
+    for sel in ("nav", "footer", "head", "script", "style"):
+        for x in body.select(sel):
+            x.decompose()
+
+    found, seen = [], set()
+    for sel in card_detect.SELECTORS:
+        for el in body.select(sel):
+            if id(el) in seen:
+                continue
+            if card_detect.DENY & set(el.get("class", [])):
+                continue
+            if card_detect._title_el(el) is None:
+                continue
+            if any(el in f.descendants for f in found):   # 이미 잡힌 카드의 자손
+                continue
+            seen.add(id(el))
+            found.append(el)
+
+    # 자손을 품은 조상이 뒤늦게 잡힌 경우 정리
+    found = [e for e in found if not any(e is not f and e in f.descendants for f in found)]
+
+    # 구조 폴백 — 셀렉터가 하나도 못 잡았을 때만. 원문 링크의 최근접 '제목 보유 조상'.
+    # 주간은 원문 링크가 없으므로(30개 중 28개가 외부 링크 0개) 적용하지 않는다.
+    if not found and kind != "weekly":
+        for a in body.find_all("a", href=True):
+            href = a["href"]
+            if not href.startswith("http") or "hong4137.github.io" in href:
+                continue
+            box = a.parent
+            while box is not None and box.name not in ("body", "html"):
+                if card_detect._title_el(box) is not None:
+                    break
+                box = box.parent
+            if box is None or box.name in ("body", "html") or id(box) in seen:
+                continue
+            seen.add(id(box))
+            found.append(box)
+        found = [e for e in found if not any(e is not f and e in f.descendants for f in found)]
+
+    # 셀렉터 체인은 클래스 순으로 섞이므로 문서 순 재정렬이 반드시 필요하다
+    order = {id(e): i for i, e in enumerate(body.find_all(True))}
+    found.sort(key=lambda e: order.get(id(e), 1 << 30))
+    return found
+
+
+def check_cards(archive_dir=None) -> int:
+    """archive/*.html 전수에서 단일 순회 탐지와 기존 구현을 대조한다. 반환: 불일치 파일 수."""
+    from bs4 import BeautifulSoup
+
+    archive_dir = Path(archive_dir or ROOT / "archive")
+    totals = {"daily": [0, 0], "weekly": [0, 0], "special": [0, 0]}
+    elapsed = [0.0, 0.0]
+    bad = 0
+    for path in sorted(archive_dir.glob("*.html")):
+        stem = path.stem
+        kind = ("weekly" if stem.startswith("weekly")
+                else "daily" if re.match(r"^\d{4}-\d{2}-\d{2}$", stem) else "special")
+        text = path.read_text("utf-8")
+        got = []
+        for k, fn in enumerate((card_detect.detect_cards, _legacy_detect_cards)):
+            soup = BeautifulSoup(text, "html.parser")
+            t0 = time.perf_counter()
+            cards = fn(soup, kind)
+            elapsed[k] += time.perf_counter() - t0
+            got.append([(el.sourceline, el.sourcepos) for el in cards])
+        if got[0] != got[1]:
+            bad += 1
+            print(f"[CARDS] 불일치 {path.name}: {len(got[0])} vs {len(got[1])}")
+        totals[kind][0] += 1
+        totals[kind][1] += len(got[0])
+    for kind, (files, cards) in totals.items():
+        print(f"[CARDS] {kind:<8}{files:>4} files / {cards:>5} cards")
+    print(f"[CARDS] 단일 순회 {elapsed[0]:.2f}s / 기존 {elapsed[1]:.2f}s · 불일치 {bad}개 파일")
+    return bad
+
+
+# ── patterns ──────────────────────────────────────────────────────
+def _legacy_entity(title, summary, patterns):
+    best_entity, best_score = None, 0.0
+    for entity_key, pattern in patterns:
+        score  = len(re.findall(pattern, title,   re.IGNORECASE)) * 3.0
+        score += len(re.findall(pattern, summary, re.IGNORECASE)) * 1.0
+        if score > best_score:
+            best_score, best_entity = score, entity_key
+    return best_entity if best_score >= 2.0 else None
+
+
+def _legacy_category(title, summary, patterns):
+    text = title + " " + summary
+    text_len = max(len(text), 1)
+    best_cat, best_score = None, 0.0
+    for category_key, pattern in patterns:
+        score = 0.0
+        for m in re.finditer(pattern, text, re.IGNORECASE):
+            score += 1.0 - (m.start() / text_len) * 0.9
+        if score > best_score:
+            best_score, best_cat = score, category_key
+    return best_cat if best_score > 0.0 else None
+
+
+def _legacy_keywords(title, summary, patterns):
+    text = f"{title} {summary}".lower()
+    keywords = {}
+    proper_nouns = re.findall(r'\b[A-Z][a-zA-Z]+\b', f"{title} {summary}")
+    keywords.update((word.lower(), None) for word in proper_nouns if len(word) > 2)
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            keywords[match.group().lower()] = None
+    return list(keywords)[:15]
+
+
+def check_patterns(briefings=None, search_index=None) -> int:
+    """
+    briefings.json의 모든 제목·요약에서 새 엔진과 기존 패턴별 루프를, search-index.json의 모든
+    기사에서 extract_keywords와 패턴별 re.search 루프를 대조한다. 반환: 불일치 수.
+    """
+    import json
+    import build_search_index as B
+    import post_process as P
+
+    data = json.loads(Path(briefings or ROOT / "briefings.json").read_text("utf-8"))
+    pairs = []
+    for key in ("briefings", "weekly", "specials"):
+        for item in data.get(key, []):
+            pairs.append((item.get("title", ""), item.get("summary", "")))
+            for seg in item.get("segments", []):
+                pairs.append((seg.get("title", ""), seg.get("summary", "")))
+
+    bad = 0
+    for title, summary in pairs:
+        for text in (title, summary, title + " " + summary):
+            for scanner, table in ((P.ENTITY_SCANNER, P.ENTITY_PATTERNS),
+                                   (P.CATEGORY_SCANNER, P.CATEGORY_PATTERNS)):
+                want = [[m.span() for m in re.finditer(p, text, re.IGNORECASE)] for _, p in table]
+                if scanner.spans(text) != want:
+                    bad += 1
+                    print(f"[SPAN] {text[:60]!r}")
+        if P.detect_entity(title, summary) != _legacy_entity(title, summary, P.ENTITY_PATTERNS):
+            bad += 1
+            print(f"[ENTITY] {title[:60]!r}")
+        if P.detect_category(title, summary) != _legacy_category(title, summary, P.CATEGORY_PATTERNS):
+            bad += 1
+            print(f"[CATEGORY] {title[:60]!r}")
+    print(f"[MATCHER] {len(pairs)}건 대조 · 불일치 {bad}건")
+
+    articles = json.loads(Path(search_index or ROOT / "search-index.json").read_text("utf-8"))["articles"]
+    kw_bad = 0
+    for a in articles:
+        title, summary = a["title"], a["summary"]
+        low = f"{title} {summary}".lower()
+        want = {}
+        for k, pattern in enumerate(B.KEYWORD_PATTERNS):
+            m = re.search(pattern, low, re.IGNORECASE)
+            if m:
+                want[k] = (m.group(), m.span())
+        if B.KEYWORD_SCANNER.first_matches(low) != want or \
+                B.extract_keywords(title, summary) != _legacy_keywords(title, summary, B.KEYWORD_PATTERNS):
+            kw_bad += 1
+            print(f"[KEYWORD] {title[:60]!r}")
+    print(f"[KEYWORD] {len(articles)}건 대조 · 불일치 {kw_bad}건")
+    return bad + kw_bad
+
+
+CHECKS = {
+    "rebuild": check_rebuild,
+    "cards": check_cards,
+    "patterns": check_patterns,
+}
+
+
+def main(argv=None):
+    names = (argv if argv is not None else sys.argv[1:]) or list(CHECKS)
+    unknown = [n for n in names if n not in CHECKS]
+    if unknown:
+        sys.exit(f"알 수 없는 점검: {', '.join(unknown)} (가능: {', '.join(CHECKS)})")
+    bad = sum(CHECKS[n]() for n in names)
+    sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()